@@ -1,5 +1,5 @@
 import { findPharmaciesNearby } from "../utils/searchHelper.js";
-import { getMLScores } from "../utils/mlHelper.js";
+import { getMLRanking } from "../utils/mlHelper.js";
 
 export const searchMedicine = async (req, res) => {
   try {
@@ -15,20 +15,13 @@ export const searchMedicine = async (req, res) => {
       return res.status(404).json({ message: "No pharmacies found nearby" });
     }
 
-    // Step 2️⃣: Get AI scores from ML service
-    const mlScores = await getMLScores(pharmacies);
+    // Step 2️⃣: Get pharmacies scored and sorted by the ML service
+    let finalResults = await getMLRanking(pharmacies);
 
-    // Step 3️⃣: Merge scores back into pharmacy list
-    const finalResults = pharmacies.map((p) => {
-      const mlResult = mlScores.find((s) => s.pharmacy_id === p.pharmacy_id);
-      return {
-        ...p,
-        ai_score: mlResult ? mlResult.ai_score : 0,
-      };
-    });
-
-    // Step 4️⃣: Sort by AI score and send response
-    finalResults.sort((a, b) => b.ai_score - a.ai_score);
+    // Step 3️⃣: Fall back to the unscored list if the ML service is unavailable
+    if (!finalResults.length) {
+      finalResults = pharmacies.map((p) => ({ ...p, ai_score: 0 }));
+    }
 
     res.json({
       message: "Search completed successfully",
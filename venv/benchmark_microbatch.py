@@ -0,0 +1,70 @@
+import json
+import logging
+import sys
+import threading
+import time
+
+import numpy as np
+
+import pharmacy_api
+
+def run_load(concurrency, requests_per_client, rows_per_request):
+    """
+    Fire /predict requests from concurrent clients and record per-request latency
+    """
+    rng = np.random.default_rng(0)
+    payload = [
+        {
+            "pharmacy_id": f"P{i:03d}",
+            "distance_km": float(rng.uniform(0.5, 10.0)),
+            "price": int(rng.integers(20, 100)),
+            "stock": int(rng.integers(10, 100))
+        }
+        for i in range(rows_per_request)
+    ]
+    latencies = [[] for _ in range(concurrency)]
+    
+    def client(slot):
+        test_client = pharmacy_api.app.test_client()
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            response = test_client.post('/predict', json=payload)
+            latencies[slot].append(time.perf_counter() - start)
+            assert response.status_code == 200, response.get_json()
+    
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    all_latencies = np.concatenate([np.asarray(l) for l in latencies]) * 1000
+    return {
+        "requests": int(all_latencies.size),
+        "throughput_rps": all_latencies.size / elapsed,
+        "p50_ms": float(np.percentile(all_latencies, 50)),
+        "p99_ms": float(np.percentile(all_latencies, 99))
+    }
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    requests_per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    rows_per_request = 10
+    
+    # Per-request INFO logs would dominate the measurement
+    logging.getLogger().setLevel(logging.WARNING)
+    if not pharmacy_api.load_ml_model():
+        sys.exit(1)
+    
+    results = []
+    for window_ms in (0, 1, 2, 5):
+        pharmacy_api.configure_micro_batching(window_ms, max_batch=4096, max_queue=4096)
+        stats = run_load(concurrency, requests_per_client, rows_per_request)
+        results.append({"window_ms": window_ms, "concurrency": concurrency, **stats})
+    
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Cold start = fresh interpreter that imports the API and loads the model.
+# Each backend is timed in its own process so module caches don't leak between runs.
+COLD_START_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+import pharmacy_api
+ok = pharmacy_api.load_ml_model(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(f"{elapsed if ok else -1:.6f} {int('sklearn' in sys.modules)}")
+"""
+
+def measure_cold_start(model_path, runs=5):
+    """
+    Time import + model load in fresh interpreters
+    """
+    timings = []
+    sklearn_imported = False
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", COLD_START_SNIPPET, model_path],
+            capture_output=True, text=True, check=True
+        ).stdout.splitlines()[-1].split()  # the API logs to stdout; the timing is the last line
+        elapsed, sklearn_flag = float(output[0]), output[1] == "1"
+        if elapsed < 0:
+            raise RuntimeError(f"Failed to load {model_path}")
+        timings.append(elapsed)
+        sklearn_imported = sklearn_flag
+    return {
+        "model_path": model_path,
+        "runs": runs,
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "sklearn_imported": sklearn_imported
+    }
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    if not os.path.exists("pharmacy_ml_model.npz"):
+        print("pharmacy_ml_model.npz not found. Run train_model.py to export it first")
+        sys.exit(1)
+    results = [
+        measure_cold_start("pharmacy_ml_model.pkl", runs),
+        measure_cold_start("pharmacy_ml_model.npz", runs)
+    ]
+    
+    print(json.dumps(results, indent=2))
+    speedup = results[0]["median_s"] / results[1]["median_s"]
+    print(f"\nCold start speedup (npz vs pickle): {speedup:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+import pharmacy_api
+from create_dataset import iter_inventory_chunks
+from train_model import create_ml_model
+
+# Reproducible benchmarks for the scoring and training paths.
+# Results are written as JSON so runs on different commits can be diffed.
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+TRAINING_SIZES = (1000, 10000, 100000)
+
+
+def make_pharmacies(num_rows, seed):
+    """
+    Seeded request payload in the shape the Node backend sends to /predict
+    """
+    _, columns = next(iter_inventory_chunks(num_rows, seed=seed, chunk_size=max(num_rows, 1)))
+    return [
+        {"pharmacy_id": pharmacy_id, "distance_km": distance, "price": price, "stock": stock}
+        for pharmacy_id, distance, price, stock in zip(
+            columns['pharmacy_id'].astype(str).tolist(), columns['distance_km'].tolist(),
+            columns['price'].tolist(), columns['stock'].tolist())
+    ]
+
+
+def time_call(fn, repeat, number=1):
+    """
+    Median and min seconds per call over repeat rounds of number calls
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return {"median_s": statistics.median(timings), "min_s": min(timings), "repeat": repeat, "number": number}
+
+
+def bench_predict_ml_scores(ml_model, seed, repeat):
+    results = []
+    for size in BATCH_SIZES:
+        pharmacies = make_pharmacies(size, seed)
+        number = max(1, 10000 // size)
+        stats = time_call(lambda: pharmacy_api.predict_ml_scores(pharmacies, ml_model), repeat, number)
+        results.append({"name": "predict_ml_scores", "batch_size": size,
+                        "rows_per_s": size / stats["median_s"], **stats})
+    return results
+
+
+def bench_predict_endpoint(seed, repeat):
+    client = pharmacy_api.app.test_client()
+    results = []
+    for size in BATCH_SIZES:
+        pharmacies = make_pharmacies(size, seed)
+        number = max(1, 2000 // size)
+
+        def call():
+            response = client.post('/predict', json=pharmacies)
+            assert response.status_code == 200, response.get_json()
+
+        stats = time_call(call, repeat, number)
+        results.append({"name": "predict_endpoint", "batch_size": size,
+                        "rows_per_s": size / stats["median_s"], **stats})
+    return results
+
+
+def bench_model_load(repeat):
+    results = []
+    for path in (pharmacy_api.MODEL_PATH, pharmacy_api.ARTIFACT_PATH):
+        if not os.path.exists(path):
+            continue
+        stats = time_call(lambda: pharmacy_api.read_ml_model(path), repeat, number=10)
+        results.append({"name": "model_load", "model_path": path, **stats})
+    return results
+
+
+def bench_training(seed, repeat):
+    results = []
+    for size in TRAINING_SIZES:
+        pharmacies = make_pharmacies(size, seed)
+        stats = time_call(lambda: create_ml_model(pharmacies), repeat)
+        results.append({"name": "create_ml_model", "rows": size,
+                        "rows_per_s": size / stats["median_s"], **stats})
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the pharmacy ML benchmark suite")
+    parser.add_argument('--output', default="benchmark_results.json", help="Where to write the JSON results")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    # Per-request logs would be part of every timing otherwise
+    logging.getLogger().setLevel(logging.WARNING)
+    if not pharmacy_api.load_ml_model():
+        raise SystemExit(1)
+    ml_model = pharmacy_api.model_registry.get()
+
+    results = []
+    results += bench_predict_ml_scores(ml_model, args.seed, args.repeat)
+    results += bench_predict_endpoint(args.seed, args.repeat)
+    results += bench_model_load(args.repeat)
+    results += bench_training(args.seed, args.repeat)
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "model_backend": ml_model['backend'],
+        "seed": args.seed,
+        "results": results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for result in results:
+        size = result.get('batch_size', result.get('rows', result.get('model_path')))
+        print(f"{result['name']:<20} {str(size):<24} {result['median_s'] * 1000:10.3f} ms")
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
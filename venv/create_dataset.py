@@ -0,0 +1,240 @@
+import argparse
+import json
+import os
+import random
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+CITIES = ["Bangalore", "Mumbai", "Delhi", "Chennai", "Kolkata", "Hyderabad", "Pune"]
+STATES = ["Karnataka", "Maharashtra", "Delhi", "Tamil Nadu", "West Bengal", "Telangana", "Maharashtra"]
+MEDICINES = ["Paracetamol", "Ibuprofen", "Amoxicillin", "Cetirizine", "Azithromycin",
+             "Metformin", "Omeprazole", "Dolo 650", "Crocin", "Pantoprazole"]
+
+# Default distributions match create_pharmacy_dataset; each is (kind, *params)
+DEFAULT_DISTRIBUTIONS = {
+    'distance_km': ('uniform', 0.5, 10.0),
+    'price': ('integers', 20, 100),
+    'stock': ('integers', 10, 100),
+}
+
+# Generated expiry dates are offsets from this day, so the same seed always gives the same file
+DEFAULT_BASE_DATE = date(2026, 1, 1)
+EPOCH_DAY = date(1970, 1, 1)
+
+# Columns written by the columnar writer, with their on-disk dtypes.
+# expiry_day is absolute (days since 1970-01-01), so it does not depend on when the files were written.
+COLUMN_DTYPES = {
+    'pharmacy_id': 'S12',
+    'medicine_name': 'S16',
+    'distance_km': '<f8',
+    'price': '<f8',
+    'stock': '<i8',
+    'expiry_day': '<i8',
+    'latitude': '<f8',
+    'longitude': '<f8',
+    'city': 'S12',
+    'state': 'S12',
+}
+
+def create_pharmacy_dataset(num_pharmacies=50):
+    """
+    Create a dataset of pharmacies with random data
+    """
+    pharmacies = []
+    
+    for i in range(num_pharmacies):
+        pharmacy_id = f"P{str(i+1).zfill(3)}"
+        name = f"Pharmacy_{i+1}"
+        
+        # Random data generation
+        distance = round(random.uniform(0.5, 10.0), 2)  # 0.5 to 10 km
+        price = random.randint(20, 100)  # 20 to 100 rupees
+        stock = random.randint(10, 100)  # 10 to 100 units
+        
+        # Random expiry date between 6 months to 2 years from now
+        days_from_now = random.randint(180, 730)
+        expiry_date = (datetime.now() + timedelta(days=days_from_now)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        
+        city = random.choice(CITIES)
+        state = random.choice(STATES)
+        
+        pharmacy_data = {
+            "pharmacy_id": pharmacy_id,
+            "name": name,
+            "distance_km": distance,
+            "price": price,
+            "stock": stock,
+            "expiry_date": expiry_date,
+            "city": city,
+            "state": state
+        }
+        
+        pharmacies.append(pharmacy_data)
+    
+    return pharmacies
+
+def sample_distribution(rng, spec, size):
+    """
+    Draw size values for a (kind, *params) spec:
+    uniform(low, high), integers(low, high) inclusive, lognormal(mean, sigma),
+    exponential(scale) or poisson(lam)
+    """
+    kind, *params = spec
+    if kind == 'uniform':
+        return np.round(rng.uniform(params[0], params[1], size), 2)
+    if kind == 'integers':
+        return rng.integers(params[0], params[1], size, endpoint=True)
+    if kind == 'lognormal':
+        return np.round(rng.lognormal(params[0], params[1], size), 2)
+    if kind == 'exponential':
+        return np.round(rng.exponential(params[0], size), 2)
+    if kind == 'poisson':
+        return rng.poisson(params[0], size)
+    raise ValueError(f"Unknown distribution {kind}")
+
+def generate_inventory_chunk(rng, start, size, distributions=DEFAULT_DISTRIBUTIONS,
+                             center=(12.9716, 77.5946), radius_deg=0.2, base_date=DEFAULT_BASE_DATE):
+    """
+    Generate size inventory rows as NumPy columns (one medicine listing per pharmacy row).
+    Locations are spread uniformly around center for spatial workloads; expiry is 180-730 days after base_date.
+    """
+    city_index = rng.integers(0, len(CITIES), size)
+    ids = np.char.add(b"P", np.char.zfill(np.arange(start + 1, start + size + 1).astype('S11'), 7))
+    return {
+        'pharmacy_id': ids,
+        'medicine_name': np.asarray(MEDICINES, dtype='S16')[rng.integers(0, len(MEDICINES), size)],
+        'distance_km': sample_distribution(rng, distributions['distance_km'], size).astype(np.float64),
+        'price': sample_distribution(rng, distributions['price'], size).astype(np.float64),
+        'stock': sample_distribution(rng, distributions['stock'], size).astype(np.int64),
+        'expiry_day': (base_date - EPOCH_DAY).days + rng.integers(180, 730, size, endpoint=True),
+        'latitude': center[0] + rng.uniform(-radius_deg, radius_deg, size),
+        'longitude': center[1] + rng.uniform(-radius_deg, radius_deg, size),
+        'city': np.asarray(CITIES, dtype='S12')[city_index],
+        'state': np.asarray(STATES, dtype='S12')[city_index],
+    }
+
+def iter_inventory_chunks(num_rows, seed=42, chunk_size=100_000, distributions=DEFAULT_DISTRIBUTIONS,
+                          base_date=DEFAULT_BASE_DATE):
+    """
+    Yield (start, columns) chunks covering num_rows rows; same seed and base_date give the same data
+    """
+    rng = np.random.default_rng(seed)
+    for start in range(0, num_rows, chunk_size):
+        yield start, generate_inventory_chunk(rng, start, min(chunk_size, num_rows - start), distributions,
+                                              base_date=base_date)
+
+def write_inventory_jsonl(filename, num_rows, seed=42, chunk_size=100_000, distributions=DEFAULT_DISTRIBUTIONS,
+                          base_date=DEFAULT_BASE_DATE):
+    """
+    Stream generated rows to a JSONL file, one inventory record per line: pharmacy_id,
+    medicine_name, distance_km, price, stock, expiry_date, latitude, longitude, city and state.
+    Unlike pharmacy_dataset.json there is no name field. Expiry dates are counted from base_date
+    rather than today.
+    """
+    expiry_cache = {}
+    with open(filename, 'w') as f:
+        for _, columns in iter_inventory_chunks(num_rows, seed, chunk_size, distributions, base_date):
+            lines = []
+            for pharmacy_id, medicine, distance, price, stock, day, lat, lon, city, state in zip(
+                    columns['pharmacy_id'].tolist(), columns['medicine_name'].tolist(),
+                    columns['distance_km'].tolist(), columns['price'].tolist(), columns['stock'].tolist(),
+                    columns['expiry_day'].tolist(), columns['latitude'].tolist(),
+                    columns['longitude'].tolist(), columns['city'].tolist(), columns['state'].tolist()):
+                if day not in expiry_cache:
+                    expiry_cache[day] = (EPOCH_DAY + timedelta(days=day)).strftime("%Y-%m-%dT00:00:00.000Z")
+                lines.append(json.dumps({
+                    "pharmacy_id": pharmacy_id.decode(),
+                    "medicine_name": medicine.decode(),
+                    "distance_km": distance,
+                    "price": price,
+                    "stock": stock,
+                    "expiry_date": expiry_cache[day],
+                    "latitude": lat,
+                    "longitude": lon,
+                    "city": city.decode(),
+                    "state": state.decode()
+                }))
+            f.write("\n".join(lines) + "\n")
+    print(f"Dataset saved to {filename} with {num_rows} rows")
+
+def write_inventory_columns(directory, num_rows, seed=42, chunk_size=100_000, distributions=DEFAULT_DISTRIBUTIONS,
+                            base_date=DEFAULT_BASE_DATE):
+    """
+    Stream generated rows to a columnar directory: one memory-mappable .npy file per column
+    """
+    os.makedirs(directory, exist_ok=True)
+    outputs = {
+        name: np.lib.format.open_memmap(os.path.join(directory, f"{name}.npy"), mode='w+',
+                                        dtype=dtype, shape=(num_rows,))
+        for name, dtype in COLUMN_DTYPES.items()
+    }
+    for start, columns in iter_inventory_chunks(num_rows, seed, chunk_size, distributions, base_date):
+        for name, output in outputs.items():
+            output[start:start + len(columns[name])] = columns[name]
+    for output in outputs.values():
+        output.flush()
+    print(f"Columnar dataset saved to {directory}/ with {num_rows} rows")
+
+def load_inventory_columns(directory, mmap_mode='r'):
+    """
+    Open a columnar dataset written by write_inventory_columns
+    """
+    return {
+        name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+        for name in COLUMN_DTYPES
+    }
+
+def parse_distribution(text):
+    """
+    Parse "kind:p1,p2" from the command line, e.g. "lognormal:3.8,0.4"
+    """
+    kind, _, params = text.partition(':')
+    return (kind, *(float(p) for p in params.split(',') if p))
+
+def save_dataset(pharmacies, filename="pharmacy_dataset.json"):
+    """
+    Save the pharmacy dataset to a JSON file
+    """
+    with open(filename, 'w') as f:
+        json.dump(pharmacies, f, indent=2)
+    
+    print(f"Dataset saved to {filename} with {len(pharmacies)} pharmacies")
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate pharmacy datasets")
+    parser.add_argument('--rows', type=int, help="Generate this many rows with the vectorized generator")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--jsonl', default="pharmacy_dataset.jsonl", help="JSONL output path ('' to skip)")
+    parser.add_argument('--base-date', type=date.fromisoformat, default=DEFAULT_BASE_DATE,
+                        help=f"Day generated expiry dates are counted from (default {DEFAULT_BASE_DATE})")
+    parser.add_argument('--columns', default="pharmacy_dataset_columns", help="Columnar output directory ('' to skip)")
+    for name, spec in DEFAULT_DISTRIBUTIONS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=parse_distribution, default=spec,
+                            help=f"Distribution for {name}, e.g. uniform:0.5,10 (default {spec})")
+    args = parser.parse_args()
+    
+    if args.rows:
+        distributions = {name: getattr(args, name) for name in DEFAULT_DISTRIBUTIONS}
+        if args.jsonl:
+            write_inventory_jsonl(args.jsonl, args.rows, args.seed, args.chunk_size, distributions,
+                                  args.base_date)
+        if args.columns:
+            write_inventory_columns(args.columns, args.rows, args.seed, args.chunk_size, distributions,
+                                    args.base_date)
+        return
+    
+    # Create dataset
+    pharmacies = create_pharmacy_dataset(50)
+    
+    # Save to file
+    save_dataset(pharmacies)
+    
+    # Print first few entries
+    print("\nFirst 5 pharmacies in dataset:")
+    for i, pharmacy in enumerate(pharmacies[:5]):
+        print(f"{i+1}. {pharmacy}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
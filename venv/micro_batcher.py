@@ -0,0 +1,137 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Queued by close() to stop the scheduler thread once earlier submissions are scored
+_STOP = object()
+
+
+class QueueFullError(RuntimeError):
+    """Raised when too many requests are already waiting to be scored"""
+
+
+class ScoringTimeoutError(RuntimeError):
+    """Raised when a submission is not scored within the caller's timeout"""
+
+
+class BatcherClosedError(RuntimeError):
+    """Raised when submitting to a batcher after close()"""
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent scoring calls into one vectorized pass.
+
+    Request threads submit their feature matrix and wait on a Future. A single
+    scheduler thread collects submissions until either window_ms has passed
+    since the first one arrived or max_batch rows are queued, stacks them
+    (grouped by model, since callers may pin different versions), scores each
+    group once and hands every caller back its own slice.
+    """
+
+    def __init__(self, score_fn, window_ms=2.0, max_batch=1024, max_queue=1024):
+        # score_fn(X, ml_model) -> 1-D array of scores
+        self._score_fn = score_fn
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._submit_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, X, ml_model):
+        """
+        Queue a feature matrix for scoring and return a Future for its scores
+        """
+        future = Future()
+        with self._submit_lock:
+            if self._closed:
+                raise BatcherClosedError("MicroBatcher is closed")
+            try:
+                self._queue.put_nowait((X, ml_model, future))
+            except queue.Full:
+                raise QueueFullError("Scoring queue is full")
+        return future
+
+    def close(self, timeout=None):
+        """
+        Stop accepting work, score whatever is already queued, then stop the scheduler thread
+        """
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+        # Blocking put: the sentinel must land behind every accepted submission
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def score(self, X, ml_model, timeout=None):
+        """
+        Blocking convenience wrapper around submit(); raises ScoringTimeoutError after timeout seconds
+        """
+        future = self.submit(X, ml_model)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Not cancelled: the scheduler may still be scoring it alongside other callers
+            raise ScoringTimeoutError(f"Scoring did not finish within {timeout}s")
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def _collect(self):
+        """
+        Block for the first submission, then gather more until the window closes or the batch is full.
+        Returns (batch, stop) where stop is set once close() has been called.
+        """
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        rows = len(item[0])
+        deadline = time.perf_counter() + self.window
+        while rows < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+            rows += len(item[0])
+        return batch, False
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch, stop = self._collect()
+
+            groups = {}
+            for item in batch:
+                groups.setdefault(id(item[1]), []).append(item)
+
+            for items in groups.values():
+                ml_model = items[0][1]
+                try:
+                    sizes = [len(X) for X, _, _ in items]
+                    scores = self._score_fn(np.vstack([X for X, _, _ in items]), ml_model)
+                    for (_, _, future), part in zip(items, np.split(scores, np.cumsum(sizes)[:-1])):
+                        future.set_result(part)
+                except Exception as e:
+                    logger.error(f"Error in micro-batch scoring: {e}")
+                    for _, _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
@@ -0,0 +1,84 @@
+import hashlib
+import numpy as np
+
+# Pickle-free serving format for the linear ranking model.
+# A plain .npz archive (no object arrays) that can be loaded with NumPy alone,
+# so the API does not need scikit-learn at import or load time.
+ARTIFACT_VERSION = 1
+
+
+class NumpyLinearModel:
+    """
+    Minimal stand-in for sklearn's LinearRegression used at serving time.
+    Exposes the same coef_, intercept_ and predict() the API relies on.
+    """
+
+    def __init__(self, coef, intercept):
+        self.coef_ = np.asarray(coef, dtype=np.float64)
+        self.intercept_ = float(intercept)
+
+    def predict(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
+
+def _checksum(coef, intercept, feature_means, feature_stds, feature_names):
+    """
+    SHA-256 over every stored field, in a fixed order
+    """
+    digest = hashlib.sha256()
+    for array in (coef, intercept, feature_means, feature_stds):
+        digest.update(np.ascontiguousarray(array, dtype="<f8").tobytes())
+    digest.update("\n".join(feature_names).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def export_model_artifact(ml_model, filename="pharmacy_ml_model.npz"):
+    """
+    Write the coefficients and scaling statistics of a trained model package to .npz
+    """
+    coef = np.asarray(ml_model['model'].coef_, dtype=np.float64)
+    intercept = np.asarray([ml_model['model'].intercept_], dtype=np.float64)
+    feature_means = np.asarray(ml_model['feature_means'], dtype=np.float64)
+    feature_stds = np.asarray(ml_model['feature_stds'], dtype=np.float64)
+    feature_names = list(ml_model['feature_names'])
+
+    np.savez(
+        filename,
+        version=np.asarray(ARTIFACT_VERSION),
+        coef=coef,
+        intercept=intercept,
+        feature_means=feature_means,
+        feature_stds=feature_stds,
+        feature_names=np.asarray(feature_names),
+        checksum=np.asarray(_checksum(coef, intercept, feature_means, feature_stds, feature_names)),
+    )
+
+
+def load_model_artifact(filename="pharmacy_ml_model.npz"):
+    """
+    Load an exported artifact into the same dict layout as the pickled model package.
+    Raises ValueError if the version is unsupported or the checksum does not match.
+    """
+    with np.load(filename, allow_pickle=False) as data:
+        version = int(data['version'])
+        if version != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported model artifact version {version}")
+
+        coef = data['coef']
+        intercept = data['intercept']
+        feature_means = data['feature_means']
+        feature_stds = data['feature_stds']
+        feature_names = data['feature_names'].tolist()
+        checksum = str(data['checksum'])
+
+    if checksum != _checksum(coef, intercept, feature_means, feature_stds, feature_names):
+        raise ValueError("Model artifact checksum mismatch")
+
+    return {
+        'model': NumpyLinearModel(coef, intercept[0]),
+        'feature_means': feature_means,
+        'feature_stds': feature_stds,
+        'feature_names': feature_names,
+        'version': version,
+        'checksum': checksum,
+    }
@@ -0,0 +1,136 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def file_digest(path):
+    """
+    Short SHA-256 of a model file, used as its version id
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+class ModelRegistry:
+    """
+    Holds a few named model versions in memory and tracks which one is active.
+
+    Loading happens outside the lock, and the (models, active) pair is replaced
+    as a single tuple, so readers never block and always see a consistent snapshot.
+    """
+
+    def __init__(self, loader, max_models=3):
+        # loader(path) -> model package dict; should raise if the model is unusable
+        self._loader = loader
+        self._max_models = max_models
+        self._lock = threading.Lock()
+        self._state = (OrderedDict(), None)
+        self._watcher = None
+
+    def get(self, version=None):
+        """
+        Return the requested version, or the active one when version is None
+        """
+        models, active = self._state
+        return models.get(version if version is not None else active)
+
+    def active_version(self):
+        return self._state[1]
+
+    def versions(self):
+        models, active = self._state
+        return [
+            {
+                "version": version,
+                "path": ml_model.get('path'),
+                "backend": ml_model.get('backend'),
+                "loaded_at": ml_model.get('loaded_at'),
+                "active": version == active
+            }
+            for version, ml_model in models.items()
+        ]
+
+    def load(self, path, version=None, activate=True):
+        """
+        Load a model file and register it under version (defaults to the file digest).
+        Returns the version id. Raises whatever the loader raises; the current
+        state is left untouched in that case.
+        """
+        version = version or file_digest(path)
+        ml_model = self._loader(path)
+        ml_model['version'] = version
+        ml_model['path'] = path
+        ml_model['loaded_at'] = time.time()
+
+        with self._lock:
+            models, active = self._state
+            models = OrderedDict(models)
+            models.pop(version, None)
+            models[version] = ml_model
+            if activate or active is None:
+                active = version
+            # Evict the oldest versions, never the active one
+            for old_version in list(models):
+                if len(models) <= self._max_models:
+                    break
+                if old_version != active:
+                    del models[old_version]
+            self._state = (models, active)
+
+        logger.info(f"Registered model version {version} from {path}{' (active)' if active == version else ''}")
+        return version
+
+    def activate(self, version):
+        """
+        Make an already loaded version the active one. Returns False if it is unknown.
+        """
+        with self._lock:
+            models, _ = self._state
+            if version not in models:
+                return False
+            self._state = (models, version)
+        logger.info(f"Activated model version {version}")
+        return True
+
+    def poll_once(self, last_mtimes):
+        """
+        Load + activate every path whose mtime differs from last_mtimes (updated in place).
+        Paths are loaded in order, so when several change together the last one ends up active.
+        """
+        for path in last_mtimes:
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            if mtime == last_mtimes[path]:
+                continue
+            last_mtimes[path] = mtime
+            try:
+                self.load(path)
+            except Exception as e:
+                logger.error(f"❌ Failed to reload model from {path}: {e}")
+
+    def watch(self, paths, interval=5.0):
+        """
+        Poll paths in a daemon thread and load + activate any of them whenever it changes
+        """
+        if self._watcher is not None:
+            return
+        last_mtimes = {path: os.path.getmtime(path) if os.path.exists(path) else None for path in paths}
+
+        def poll():
+            while True:
+                time.sleep(interval)
+                self.poll_once(last_mtimes)
+
+        self._watcher = threading.Thread(target=poll, name="model-watcher", daemon=True)
+        self._watcher.start()
+        logger.info(f"Watching {', '.join(paths)} for model updates every {interval}s")
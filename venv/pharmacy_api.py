@@ -0,0 +1,943 @@
+import os
+import hmac
+import logging
+import sys
+import time
+import pickle
+from datetime import timedelta
+import numpy as np
+from flask import Flask, Response, g, request, jsonify
+from flask_cors import CORS
+from instrumentation import PROMETHEUS_CONTENT_TYPE, SIZE_BUCKETS, MetricsRegistry, SampledProfiler
+from model_artifact import load_model_artifact
+from micro_batcher import BatcherClosedError, MicroBatcher, QueueFullError, ScoringTimeoutError
+from model_registry import ModelRegistry
+from spatial_index import EPOCH_DAY, InventoryIndex
+from wire_format import BINARY_MIME_TYPE, WireFormatError, decode_features, encode_scores
+
+# Configure logging to show in console
+logging.basicConfig(
+    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+app = Flask(__name__)
+CORS(app, resources={r"/*": {"origins": "*"}})
+
+# Prometheus metrics exposed at /metrics
+metrics = MetricsRegistry()
+STAGE_SECONDS = metrics.histogram(
+    "pharmacy_api_stage_seconds", "Time spent in each stage of a scoring request", labelnames=("stage",))
+REQUEST_SECONDS = metrics.histogram(
+    "pharmacy_api_request_seconds", "End-to-end request handling time", labelnames=("endpoint",))
+REQUESTS_TOTAL = metrics.counter(
+    "pharmacy_api_requests_total", "Requests handled", labelnames=("endpoint", "status"))
+REJECTED_ROWS = metrics.counter(
+    "pharmacy_api_rejected_rows_total", "Pharmacies rejected during validation")
+BATCH_ROWS = metrics.histogram(
+    "pharmacy_api_batch_rows", "Rows per model.predict call", buckets=SIZE_BUCKETS)
+
+# Sampled cProfile capture, started through /admin/profile
+profiler = SampledProfiler()
+
+MODEL_PATH = "pharmacy_ml_model.pkl"
+ARTIFACT_PATH = "pharmacy_ml_model.npz"
+MODEL_VERSION_HEADER = "X-Model-Version"
+
+def default_model_path():
+    """
+    MODEL_PATH env var if set, otherwise the newer of the pickle and the pickle-free artifact.
+    A pickle shipped on its own after an older export still wins.
+    """
+    if os.environ.get("MODEL_PATH"):
+        return os.environ["MODEL_PATH"]
+    if not os.path.exists(ARTIFACT_PATH):
+        return MODEL_PATH
+    if os.path.exists(MODEL_PATH) and os.path.getmtime(MODEL_PATH) > os.path.getmtime(ARTIFACT_PATH):
+        logger.warning(f"{MODEL_PATH} is newer than {ARTIFACT_PATH}; loading the pickle. Re-run train_model.py to refresh the artifact")
+        return MODEL_PATH
+    return ARTIFACT_PATH
+
+def read_ml_model(model_path):
+    """
+    Read and sanity-check a model file without activating it.
+    .npz artifacts are scored with pure NumPy; anything else is unpickled (requires scikit-learn).
+    """
+    if model_path.endswith('.npz'):
+        ml_model = load_model_artifact(model_path)
+        ml_model['backend'] = 'numpy'
+    else:
+        with open(model_path, 'rb') as f:
+            ml_model = pickle.load(f)
+        ml_model['backend'] = 'sklearn'
+    
+    if list(ml_model['feature_names']) != FEATURE_FIELDS:
+        raise ValueError(f"Unexpected feature names {ml_model['feature_names']}")
+    probe = score_feature_matrix(np.asarray([ml_model['feature_means']], dtype=np.float64), ml_model)
+    if probe.shape != (1,) or not np.isfinite(probe).all():
+        raise ValueError("Model produced an invalid score for a probe row")
+    return ml_model
+
+# Loaded model versions; requests pick one with the X-Model-Version header
+model_registry = ModelRegistry(read_ml_model, max_models=int(os.environ.get("MAX_MODEL_VERSIONS", 3)))
+
+def load_ml_model(model_path=None):
+    """
+    Load the trained ML model and make it the active version
+    """
+    model_path = model_path or default_model_path()
+    try:
+        version = model_registry.load(model_path)
+        ml_model = model_registry.get(version)
+        logger.info("✅ ML Model loaded successfully")
+        logger.info(f"Model type: {type(ml_model['model']).__name__} ({ml_model['backend']} backend, {model_path})")
+        logger.info(f"Feature names: {ml_model['feature_names']}")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Failed to load ML model: {e}")
+        return False
+
+def resolve_model():
+    """
+    Pick the model for this request: the version named in the X-Model-Version
+    header if present, otherwise the active one.
+    Returns (ml_model, error_response).
+    """
+    # An empty header means "no preference", same as leaving it out
+    version = request.headers.get(MODEL_VERSION_HEADER) or None
+    ml_model = model_registry.get(version)
+    if ml_model is not None:
+        g.model_version = ml_model['version']
+        return ml_model, None
+    if version:
+        return None, (jsonify({
+            "error": f"Unknown model version {version}",
+            "status": "error"
+        }), 404)
+    return None, (jsonify({
+        "error": "ML Model not loaded. Please check if pharmacy_ml_model.pkl exists",
+        "status": "error"
+    }), 500)
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    g.profile = profiler.maybe_start_sample()
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.endpoint or "unknown"
+    REQUEST_SECONDS.observe(time.perf_counter() - g.request_start, endpoint)
+    REQUESTS_TOTAL.inc(endpoint, str(response.status_code))
+    return response
+
+@app.teardown_request
+def finish_profile_sample(exc):
+    # Teardown also runs after unhandled exceptions, so the profiler is always disabled
+    if g.get('profile') is not None:
+        profiler.finish_sample(g.profile)
+        g.profile = None
+
+@app.after_request
+def add_model_version_header(response):
+    version = g.get('model_version')
+    if version:
+        response.headers[MODEL_VERSION_HEADER] = version
+    return response
+
+FEATURE_FIELDS = ['distance_km', 'price', 'stock']
+
+def _safe_float(value):
+    """
+    Convert a single value to float, returning NaN when it is not numeric
+    """
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+def _to_float_column(values):
+    """
+    Convert a list of raw JSON values to a float64 column.
+    Missing or non-numeric entries become NaN.
+    """
+    try:
+        column = np.asarray(values, dtype=np.float64)
+        # Lists of equal length convert cleanly into a 2-D array; treat them as junk too
+        if column.ndim == 1:
+            return column
+    except (ValueError, TypeError):
+        pass
+    # Slow path only when the column contains junk (e.g. "abc" or nested objects)
+    return np.fromiter((_safe_float(v) for v in values), dtype=np.float64, count=len(values))
+
+def build_feature_matrix(pharmacies):
+    """
+    Validate a list of pharmacies column-wise and build the feature matrix.
+    Returns (valid_pharmacies, X, rejected_count).
+    """
+    start = time.perf_counter()
+    records = [p if isinstance(p, dict) else {} for p in pharmacies]
+    
+    columns = [_to_float_column([p.get(field) for p in records]) for field in FEATURE_FIELDS]
+    X = np.column_stack(columns) if records else np.empty((0, len(FEATURE_FIELDS)))
+    built = time.perf_counter()
+    STAGE_SECONDS.observe(built - start, "feature_matrix")
+    
+    has_id = np.fromiter((p.get('pharmacy_id') is not None for p in records), dtype=bool, count=len(records))
+    valid_mask = has_id & np.isfinite(X).all(axis=1)
+    
+    if valid_mask.all():
+        STAGE_SECONDS.observe(time.perf_counter() - built, "validation")
+        return records, X, 0
+    
+    valid_indices = np.flatnonzero(valid_mask)
+    valid_pharmacies = [records[i] for i in valid_indices]
+    rejected = len(records) - len(valid_pharmacies)
+    REJECTED_ROWS.inc(amount=rejected)
+    if logger.isEnabledFor(logging.DEBUG):
+        for i in np.flatnonzero(~valid_mask):
+            logger.debug(f"Rejected pharmacy {records[i].get('pharmacy_id', 'Unknown')}: missing or invalid fields")
+    X = X[valid_mask]
+    STAGE_SECONDS.observe(time.perf_counter() - built, "validation")
+    return valid_pharmacies, X, rejected
+
+def score_feature_matrix(X, ml_model):
+    """
+    Scale a feature matrix with the stored means/stds and predict scores
+    """
+    start = time.perf_counter()
+    X_scaled = (X - np.asarray(ml_model['feature_means'])) / np.asarray(ml_model['feature_stds'])
+    scaled = time.perf_counter()
+    scores = ml_model['model'].predict(X_scaled)
+    STAGE_SECONDS.observe(scaled - start, "scaling")
+    STAGE_SECONDS.observe(time.perf_counter() - scaled, "predict")
+    BATCH_ROWS.observe(len(X))
+    return scores
+
+# Optional micro-batching scheduler shared by request threads (see configure_micro_batching)
+micro_batcher = None
+
+def configure_micro_batching(window_ms, max_batch=1024, max_queue=1024):
+    """
+    Route per-request scoring through a MicroBatcher; window_ms <= 0 disables it.
+    Any previous batcher is drained and its thread stopped.
+    
+    Off by default: each request waits up to window_ms for company, and the
+    scheduler thread competes with request threads for the GIL. In-process
+    runs of benchmark_microbatch.py showed p50 rising from ~0.65ms to ~5ms at
+    a 1ms window, and throughput falling at a 5ms window. Only enable it after
+    measuring a gain for your deployment.
+    """
+    global micro_batcher
+    previous = micro_batcher
+    micro_batcher = MicroBatcher(score_feature_matrix, window_ms, max_batch, max_queue) if window_ms > 0 else None
+    if previous is not None:
+        previous.close()
+    if micro_batcher:
+        logger.info(f"Micro-batching enabled: window={window_ms}ms, max_batch={max_batch}, max_queue={max_queue}")
+
+# Upper bound on how long a request waits for the micro-batcher before answering 503
+MICRO_BATCH_TIMEOUT_S = float(os.environ.get("MICRO_BATCH_TIMEOUT_S", 10))
+
+def score_request_matrix(X, ml_model):
+    """
+    Score one request's feature matrix, coalescing with concurrent requests when micro-batching is on
+    """
+    # Read the global once: configure_micro_batching may swap it concurrently
+    batcher = micro_batcher
+    if batcher is None:
+        return score_feature_matrix(X, ml_model)
+    try:
+        return batcher.score(X, ml_model, timeout=MICRO_BATCH_TIMEOUT_S)
+    except BatcherClosedError:
+        # Replaced between the read above and submit(); score this one directly
+        return score_feature_matrix(X, ml_model)
+
+# Optional in-process inventory snapshot backing /search (see load_inventory_snapshot)
+inventory_index = None
+
+def load_inventory_snapshot(path):
+    """
+    Load a pharmacy/medicine snapshot (JSONL or columnar directory) into the spatial index
+    """
+    global inventory_index
+    try:
+        index = InventoryIndex(cell_deg=float(os.environ.get("INVENTORY_CELL_DEG", 0.1)))
+        index.load_snapshot(path)
+        inventory_index = index
+        logger.info(f"✅ Inventory snapshot loaded: {len(index)} rows from {path}")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Failed to load inventory snapshot: {e}")
+        return False
+
+def top_k_indices(scores, k):
+    """
+    Return the indices of the k highest scores, best first.
+    Uses argpartition so only the selected k elements get sorted.
+    """
+    n = len(scores)
+    if k >= n:
+        return np.argsort(-scores, kind='stable')
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+def format_score_results(pharmacies, scores):
+    """
+    Pair each pharmacy id with its rounded score
+    """
+    rounded = np.round(scores, 4).tolist()
+    return [
+        {"pharmacy_id": pharmacy['pharmacy_id'], "ai_score": score}
+        for pharmacy, score in zip(pharmacies, rounded)
+    ]
+
+def predict_binary_scores(body, ml_model):
+    """
+    Score a binary feature payload (see wire_format.py).
+    Returns one score per row, NaN for rows with non-finite features.
+    """
+    with STAGE_SECONDS.time("parse"):
+        # Scores are returned positionally, so the optional id column is not decoded
+        X, _ = decode_features(body, n_features=len(FEATURE_FIELDS))
+    scores = np.full(X.shape[0], np.nan)
+    valid_mask = np.isfinite(X).all(axis=1)
+    if valid_mask.all():
+        if len(X):
+            scores = score_request_matrix(X, ml_model)
+        return scores
+    
+    REJECTED_ROWS.inc(amount=int((~valid_mask).sum()))
+    if valid_mask.any():
+        scores[valid_mask] = score_request_matrix(X[valid_mask], ml_model)
+    return scores
+
+def predict_ml_scores(pharmacies, ml_model):
+    """
+    Use the trained ML model to predict scores
+    """
+    try:
+        valid_pharmacies, X, _ = build_feature_matrix(pharmacies)
+        
+        # Predict scores using ML model
+        scores = score_feature_matrix(X, ml_model)
+        
+        # Combine results
+        return format_score_results(valid_pharmacies, scores)
+        
+    except Exception as e:
+        logger.error(f"Error in ML prediction: {e}")
+        return []
+
+@app.route('/health', methods=['GET'])
+def health_check():
+    logger.debug("Health check endpoint called")
+    ml_model = model_registry.get()
+    status = "healthy" if ml_model is not None else "model not loaded"
+    return jsonify({
+        "status": status,
+        "message": "ML API is running",
+        "model_loaded": ml_model is not None,
+        "model_type": "LinearRegression" if ml_model else "None",
+        "model_version": model_registry.active_version()
+    })
+
+@app.route('/predict', methods=['POST'])
+def predict_scores():
+    """
+    Predict AI scores for pharmacies using the trained ML model
+    """
+    try:
+        # Check if model is loaded (or the requested version exists)
+        ml_model, error = resolve_model()
+        if error:
+            return error
+        
+        # Columnar binary payloads skip JSON entirely
+        if request.mimetype == BINARY_MIME_TYPE:
+            try:
+                scores = predict_binary_scores(request.get_data(), ml_model)
+            except WireFormatError as e:
+                return jsonify({
+                    "error": f"Invalid binary payload: {e}",
+                    "status": "error"
+                }), 400
+            with STAGE_SECONDS.time("serialize"):
+                response = Response(encode_scores(scores), mimetype=BINARY_MIME_TYPE)
+            return response
+        
+        # Get JSON data from request
+        with STAGE_SECONDS.time("parse"):
+            pharmacies = request.get_json(silent=True)
+        
+        # Log the incoming request
+        logger.debug(f"Received prediction request for {len(pharmacies) if isinstance(pharmacies, list) else 'unknown'} pharmacies")
+        
+        # Validate input is a list
+        if not isinstance(pharmacies, list):
+            return jsonify({
+                "error": "Input must be an array of pharmacies",
+                "status": "error"
+            }), 400
+        
+        # Validate all pharmacies at once and build the feature matrix
+        valid_pharmacies, X, rejected = build_feature_matrix(pharmacies)
+        if rejected:
+            logger.warning(f"Skipped {rejected} pharmacies with missing or invalid fields")
+        
+        if not valid_pharmacies:
+            return jsonify({
+                "error": "No valid pharmacies found in request",
+                "status": "error"
+            }), 400
+        
+        # Predict scores using ML model
+        scores = score_request_matrix(X, ml_model)
+        results = format_score_results(valid_pharmacies, scores)
+        
+        logger.debug(f"Successfully processed {len(results)} pharmacies using ML model")
+        
+        with STAGE_SECONDS.time("serialize"):
+            response = jsonify(results)
+        return response
+    
+    except (QueueFullError, ScoringTimeoutError):
+        return jsonify({
+            "error": "Scoring queue is full, retry later",
+            "status": "error"
+        }), 503
+    
+    except Exception as e:
+        logger.error(f"Error processing prediction request: {str(e)}")
+        return jsonify({
+            "error": "Internal server error",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+@app.route('/rank', methods=['POST'])
+def rank_pharmacies():
+    """
+    Score pharmacies and return only the top-k, best first.
+    Accepts either a plain array of pharmacies (k from the query string)
+    or an object {"pharmacies": [...], "k": 10}.
+    """
+    try:
+        ml_model, error = resolve_model()
+        if error:
+            return error
+        
+        payload = request.get_json(silent=True)
+        k = request.args.get('k')
+        if isinstance(payload, dict):
+            pharmacies = payload.get('pharmacies')
+            k = payload.get('k', k)
+        else:
+            pharmacies = payload
+        
+        if not isinstance(pharmacies, list):
+            return jsonify({
+                "error": "Input must be an array of pharmacies",
+                "status": "error"
+            }), 400
+        if not pharmacies:
+            return jsonify({
+                "error": "No pharmacies provided",
+                "status": "error"
+            }), 400
+        
+        try:
+            k = len(pharmacies) if k is None else int(k)
+        except (ValueError, TypeError, OverflowError):
+            return jsonify({
+                "error": "k must be an integer",
+                "status": "error"
+            }), 400
+        if k <= 0:
+            return jsonify({
+                "error": "k must be a positive integer",
+                "status": "error"
+            }), 400
+        
+        valid_pharmacies, X, rejected = build_feature_matrix(pharmacies)
+        if rejected:
+            logger.warning(f"Skipped {rejected} pharmacies with missing or invalid fields")
+        
+        if not valid_pharmacies:
+            return jsonify({
+                "error": "No valid pharmacies found in request",
+                "status": "error"
+            }), 400
+        
+        scores = score_request_matrix(X, ml_model)
+        top = top_k_indices(scores, k)
+        top_scores = np.round(scores[top], 4).tolist()
+        
+        results = [
+            {**valid_pharmacies[i], "ai_score": score}
+            for i, score in zip(top.tolist(), top_scores)
+        ]
+        
+        return jsonify({
+            "results": results,
+            "total_valid": len(valid_pharmacies),
+            "rejected": rejected,
+            "status": "success"
+        })
+    
+    except (QueueFullError, ScoringTimeoutError):
+        return jsonify({
+            "error": "Scoring queue is full, retry later",
+            "status": "error"
+        }), 503
+    
+    except Exception as e:
+        logger.error(f"Error processing rank request: {str(e)}")
+        return jsonify({
+            "error": "Internal server error",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    """
+    Score many independent candidate lists in one call.
+    Expects {"queries": [{"query_id": ..., "pharmacies": [...], "k": 5}, ...], "k": 10}.
+    All queries are stacked into one feature matrix and scored in a single pass;
+    a per-query "k" (or the top-level default) returns only that query's top-k.
+    """
+    try:
+        ml_model, error = resolve_model()
+        if error:
+            return error
+        
+        payload = request.get_json(silent=True)
+        queries = payload.get('queries') if isinstance(payload, dict) else None
+        if not isinstance(queries, list):
+            return jsonify({
+                "error": "Input must be an object with a 'queries' array",
+                "status": "error"
+            }), 400
+        default_k = payload.get('k')
+        
+        # Validate each query and remember where its rows sit in the stacked matrix
+        query_ids, query_ks, query_pharmacies, query_rejected, matrices = [], [], [], [], []
+        for position, query in enumerate(queries):
+            if not isinstance(query, dict) or not isinstance(query.get('pharmacies'), list):
+                return jsonify({
+                    "error": f"Query at position {position} must contain a 'pharmacies' array",
+                    "status": "error"
+                }), 400
+            
+            k = query.get('k', default_k)
+            try:
+                k = None if k is None else int(k)
+            except (ValueError, TypeError, OverflowError):
+                k = 0
+            if k is not None and k <= 0:
+                return jsonify({
+                    "error": f"k for query at position {position} must be a positive integer",
+                    "status": "error"
+                }), 400
+            
+            valid_pharmacies, X, rejected = build_feature_matrix(query['pharmacies'])
+            query_ids.append(query.get('query_id', position))
+            query_ks.append(k)
+            query_pharmacies.append(valid_pharmacies)
+            query_rejected.append(rejected)
+            matrices.append(X)
+        
+        total_rejected = sum(query_rejected)
+        if total_rejected:
+            logger.warning(f"Skipped {total_rejected} pharmacies with missing or invalid fields")
+        
+        # One scaler + predict pass for every query
+        sizes = [len(p) for p in query_pharmacies]
+        if sum(sizes):
+            all_scores = score_feature_matrix(np.vstack(matrices), ml_model)
+        else:
+            all_scores = np.empty(0)
+        split_scores = np.split(all_scores, np.cumsum(sizes)[:-1])
+        
+        results = []
+        for query_id, k, pharmacies, rejected, scores in zip(
+                query_ids, query_ks, query_pharmacies, query_rejected, split_scores):
+            if k is not None and len(scores):
+                top = top_k_indices(scores, k)
+                pharmacies = [pharmacies[i] for i in top.tolist()]
+                scores = scores[top]
+            results.append({
+                "query_id": query_id,
+                "scores": format_score_results(pharmacies, scores),
+                "rejected": rejected
+            })
+        
+        return jsonify({
+            "results": results,
+            "status": "success"
+        })
+    
+    except Exception as e:
+        logger.error(f"Error processing batch prediction request: {str(e)}")
+        return jsonify({
+            "error": "Internal server error",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+@app.route('/search', methods=['POST'])
+def search_inventory():
+    """
+    Find pharmacies stocking a medicine near a point and return the top-k by model score.
+    Expects {"medicine_name": "...", "latitude": 12.97, "longitude": 77.59, "radius_km": 20, "k": 10}.
+    """
+    try:
+        ml_model, error = resolve_model()
+        if error:
+            return error
+        
+        if inventory_index is None:
+            return jsonify({
+                "error": "Inventory index not loaded. Set INVENTORY_SNAPSHOT or POST /inventory/upsert",
+                "status": "error"
+            }), 503
+        
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict) or not payload.get('medicine_name'):
+            return jsonify({
+                "error": "medicine_name, latitude and longitude are required",
+                "status": "error"
+            }), 400
+        try:
+            latitude = float(payload['latitude'])
+            longitude = float(payload['longitude'])
+            radius_km = float(payload.get('radius_km', 20))
+            k = int(payload.get('k', 10))
+        except (KeyError, ValueError, TypeError, OverflowError):
+            return jsonify({
+                "error": "latitude, longitude, radius_km and k must be numbers",
+                "status": "error"
+            }), 400
+        if not np.isfinite([latitude, longitude, radius_km]).all():
+            return jsonify({
+                "error": "latitude, longitude and radius_km must be finite",
+                "status": "error"
+            }), 400
+        if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+            return jsonify({
+                "error": "latitude must be within ±90 and longitude within ±180",
+                "status": "error"
+            }), 400
+        if k <= 0 or radius_km <= 0:
+            return jsonify({
+                "error": "k and radius_km must be positive",
+                "status": "error"
+            }), 400
+        
+        matches = inventory_index.search(payload['medicine_name'], latitude, longitude, radius_km)
+        results = []
+        if len(matches['pharmacy_id']):
+            X = np.column_stack([matches['distance_km'], matches['price'], matches['stock']])
+            scores = score_request_matrix(X, ml_model)
+            top = top_k_indices(scores, k)
+            for i, score in zip(top.tolist(), np.round(scores[top], 4).tolist()):
+                expiry = EPOCH_DAY + timedelta(days=int(matches['expiry_day'][i]))
+                results.append({
+                    "pharmacy_id": matches['pharmacy_id'][i],
+                    "name": matches['name'][i],
+                    "medicine_name": matches['medicine_name'][i],
+                    "distance_km": round(float(matches['distance_km'][i]), 3),
+                    "price": float(matches['price'][i]),
+                    "stock": int(matches['stock'][i]),
+                    "expiry_date": f"{expiry.isoformat()}T00:00:00.000Z",
+                    "coordinates": [float(matches['longitude'][i]), float(matches['latitude'][i])],
+                    "ai_score": score
+                })
+        
+        return jsonify({
+            "medicine_name": payload['medicine_name'],
+            "total_matches": len(matches['pharmacy_id']),
+            "total_results": len(results),
+            "pharmacies": results,
+            "status": "success"
+        })
+    
+    except (QueueFullError, ScoringTimeoutError):
+        return jsonify({
+            "error": "Scoring queue is full, retry later",
+            "status": "error"
+        }), 503
+    
+    except Exception as e:
+        logger.error(f"Error processing search request: {str(e)}")
+        return jsonify({
+            "error": "Internal server error",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+@app.route('/model_info', methods=['GET'])
+def model_info():
+    """
+    Get information about the loaded ML model
+    """
+    ml_model, error = resolve_model()
+    if error:
+        return error
+    
+    return jsonify({
+        "model_type": type(ml_model['model']).__name__,
+        "version": ml_model['version'],
+        "active": ml_model['version'] == model_registry.active_version(),
+        "backend": ml_model.get('backend', 'sklearn'),
+        "artifact_checksum": ml_model.get('checksum'),
+        "feature_names": ml_model['feature_names'],
+        "coefficients": ml_model['model'].coef_.tolist(),
+        "intercept": float(ml_model['model'].intercept_),
+        "status": "loaded"
+    })
+
+def is_admin_request():
+    """
+    Admin endpoints require the X-Admin-Token header to match the ADMIN_TOKEN env var.
+    They are disabled entirely when ADMIN_TOKEN is not set.
+    """
+    token = os.environ.get("ADMIN_TOKEN")
+    if not token:
+        return False
+    return hmac.compare_digest(request.headers.get("X-Admin-Token", ""), token)
+
+def resolve_reload_path(path):
+    """
+    Map a client-supplied model path to a file inside MODEL_DIR (default: working directory).
+    Only .npz artifacts are accepted unless ALLOW_PICKLE_RELOAD=1, since unpickling runs code.
+    Returns None if the path is not allowed.
+    """
+    model_dir = os.path.realpath(os.environ.get("MODEL_DIR", "."))
+    resolved = os.path.realpath(os.path.join(model_dir, str(path)))
+    if not resolved.startswith(model_dir + os.sep):
+        return None
+    allowed = ('.npz', '.pkl') if os.environ.get("ALLOW_PICKLE_RELOAD") == "1" else ('.npz',)
+    if not resolved.endswith(allowed):
+        return None
+    return resolved
+
+@app.route('/models', methods=['GET'])
+def list_models():
+    """
+    List the model versions held in memory
+    """
+    return jsonify({
+        "active_version": model_registry.active_version(),
+        "models": model_registry.versions(),
+        "status": "success"
+    })
+
+@app.route('/inventory/upsert', methods=['POST'])
+def upsert_inventory():
+    """
+    Insert or replace inventory rows keyed by (pharmacy_id, medicine_name) without a full rebuild.
+    Body is an array of rows with pharmacy_id, medicine_name, latitude, longitude,
+    price, stock, expiry_date and optionally name.
+    """
+    global inventory_index
+    if not is_admin_request():
+        return jsonify({
+            "error": "Admin token required",
+            "status": "error"
+        }), 403
+    
+    try:
+        rows = request.get_json(silent=True)
+        if not isinstance(rows, list):
+            return jsonify({
+                "error": "Input must be an array of inventory rows",
+                "status": "error"
+            }), 400
+        
+        if inventory_index is None:
+            inventory_index = InventoryIndex(cell_deg=float(os.environ.get("INVENTORY_CELL_DEG", 0.1)))
+        accepted = inventory_index.upsert(rows)
+        
+        return jsonify({
+            "accepted": accepted,
+            "rejected": len(rows) - accepted,
+            "total_rows": len(inventory_index),
+            "status": "success"
+        })
+    
+    except Exception as e:
+        logger.error(f"Error processing inventory upsert: {str(e)}")
+        return jsonify({
+            "error": "Internal server error",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """
+    Prometheus text exposition of request, stage and batch metrics
+    """
+    return Response(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+@app.route('/admin/profile', methods=['GET', 'POST'])
+def profile_requests():
+    """
+    POST {"duration": 30, "sample_every": 10} starts sampled cProfile capture;
+    GET returns the aggregated stats collected so far as text.
+    """
+    if not is_admin_request():
+        return jsonify({
+            "error": "Admin token required",
+            "status": "error"
+        }), 403
+    
+    if request.method == 'GET':
+        try:
+            limit = int(request.args.get('limit', 30))
+        except ValueError:
+            limit = 0
+        if limit <= 0:
+            return jsonify({
+                "error": "limit must be a positive integer",
+                "status": "error"
+            }), 400
+        return Response(profiler.report(limit=limit), mimetype="text/plain")
+    
+    # An empty body starts a capture with the defaults
+    payload = request.get_json(silent=True) if request.get_data() else {}
+    if not isinstance(payload, dict):
+        return jsonify({
+            "error": "Request body must be a JSON object",
+            "status": "error"
+        }), 400
+    try:
+        duration = float(payload.get('duration', 30))
+        sample_every = int(payload.get('sample_every', 10))
+    except (ValueError, TypeError, OverflowError):
+        duration = sample_every = 0
+    if not np.isfinite(duration) or duration <= 0 or sample_every <= 0:
+        return jsonify({
+            "error": "duration and sample_every must be positive numbers",
+            "status": "error"
+        }), 400
+    profiler.start(duration, sample_every)
+    logger.info(f"Profiling every {sample_every} requests for {duration}s")
+    return jsonify({
+        "duration": duration,
+        "sample_every": sample_every,
+        "status": "success"
+    })
+
+@app.route('/reload', methods=['POST'])
+def reload_model():
+    """
+    Load a model file into the registry, or switch the active version.
+    Body (all optional): {"path": "...", "version": "name", "activate": true}.
+    Without a path, an already loaded "version" is activated; with neither,
+    the default model path is reloaded. path is relative to MODEL_DIR.
+    """
+    if not is_admin_request():
+        return jsonify({
+            "error": "Admin token required",
+            "status": "error"
+        }), 403
+    
+    # An empty body reloads the default model path
+    payload = request.get_json(silent=True) if request.get_data() else {}
+    if not isinstance(payload, dict):
+        return jsonify({
+            "error": "Request body must be a JSON object",
+            "status": "error"
+        }), 400
+    path = payload.get('path')
+    version = payload.get('version')
+    activate = bool(payload.get('activate', True))
+    if not isinstance(path, (str, type(None))) or not isinstance(version, (str, type(None))):
+        return jsonify({
+            "error": "path and version must be strings",
+            "status": "error"
+        }), 400
+    
+    if path:
+        path = resolve_reload_path(path)
+        if path is None:
+            return jsonify({
+                "error": "Model path not allowed",
+                "status": "error"
+            }), 400
+    
+    if version and not path:
+        if not model_registry.activate(version):
+            return jsonify({
+                "error": f"Unknown model version {version}",
+                "status": "error"
+            }), 404
+    else:
+        try:
+            version = model_registry.load(path or default_model_path(), version=version, activate=activate)
+        except Exception as e:
+            logger.error(f"❌ Failed to reload ML model: {e}")
+            return jsonify({
+                "error": "Failed to load model",
+                "status": "error"
+            }), 400
+    
+    return jsonify({
+        "version": version,
+        "active_version": model_registry.active_version(),
+        "status": "success"
+    })
+
+@app.errorhandler(404)
+def not_found(error):
+    return jsonify({
+        "error": "Endpoint not found",
+        "status": "error"
+    }), 404
+
+@app.errorhandler(405)
+def method_not_allowed(error):
+    return jsonify({
+        "error": "Method not allowed",
+        "status": "error"
+    }), 405
+
+if __name__ == '__main__':
+    try:
+        # Load the ML model when starting the server
+        model_loaded = load_ml_model()
+        
+        if not model_loaded:
+            logger.error("❌ Failed to load ML model. Please run train_model.py first")
+            sys.exit(1)
+        
+        port = int(os.environ.get("PORT", 5001))
+        logger.info(f"🚀 Starting ML API on http://0.0.0.0:{port}")
+        logger.info(f"🤖 Using model version: {model_registry.active_version()}")
+        
+        configure_micro_batching(
+            float(os.environ.get("MICRO_BATCH_WINDOW_MS", 0)),
+            max_batch=int(os.environ.get("MICRO_BATCH_MAX_ROWS", 1024)),
+            max_queue=int(os.environ.get("MICRO_BATCH_MAX_QUEUE", 1024))
+        )
+        
+        if os.environ.get("INVENTORY_SNAPSHOT"):
+            load_inventory_snapshot(os.environ["INVENTORY_SNAPSHOT"])
+        
+        watch_interval = float(os.environ.get("MODEL_WATCH_INTERVAL", 0))
+        if watch_interval > 0:
+            watched = [os.environ["MODEL_PATH"]] if os.environ.get("MODEL_PATH") else [MODEL_PATH, ARTIFACT_PATH]
+            model_registry.watch(watched, interval=watch_interval)
+        app.run(host="0.0.0.0", port=port, debug=False, threaded=True)
+        
+    except Exception as e:
+        logger.error(f"Failed to start server: {e}")
+        sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,425 @@
+import json
+import os
+import threading
+from datetime import date, datetime
+
+import numpy as np
+
+from create_dataset import EPOCH_DAY, load_inventory_columns
+
+# In-process pharmacy/medicine inventory index for radius + medicine queries.
+#
+# Rows live in columnar NumPy arrays sorted by a uniform lat/lon grid cell key,
+# so a radius query is a handful of np.searchsorted range lookups (one per grid
+# row) followed by a vectorized haversine filter. Upserts are appended to a small
+# delta buffer and tombstone the row they replace; the delta is merged back into
+# the sorted arrays once it grows past the compaction threshold. Readers always
+# work on an immutable snapshot, swapped in as one reference by writers.
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.195
+
+NUMERIC_COLUMNS = ('latitude', 'longitude', 'price', 'stock', 'expiry_day')
+ALL_COLUMNS = ('pharmacy_id', 'name', 'medicine_code') + NUMERIC_COLUMNS
+COLUMN_DTYPES = {
+    'pharmacy_id': object,
+    'name': object,
+    'medicine_code': np.int32,
+    **{column: np.float64 for column in NUMERIC_COLUMNS}
+}
+
+# With compact_threshold=None, compact once the delta holds this share of the main rows (at least MIN_COMPACT_ROWS)
+COMPACT_FRACTION = 0.05
+MIN_COMPACT_ROWS = 1_000
+
+
+def haversine_km(lat, lon, latitudes, longitudes):
+    """
+    Great-circle distance in km from one point to arrays of points
+    """
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+# Expiry days outside this range cannot be turned back into a date for responses
+MIN_EPOCH_DAY = (date.min - EPOCH_DAY).days
+MAX_EPOCH_DAY = (date.max - EPOCH_DAY).days
+
+
+def to_epoch_day(value):
+    """
+    Convert an ISO date/datetime string (e.g. Mongo's 2026-02-20T00:00:00.000Z) or a day number
+    to days since 1970-01-01. Raises ValueError for anything that is not a representable date.
+    """
+    if isinstance(value, (int, float)):
+        if not np.isfinite(value) or not MIN_EPOCH_DAY <= value <= MAX_EPOCH_DAY:
+            raise ValueError(f"Expiry day {value} out of range")
+        return int(value)
+    text = str(value)[:10]
+    return (datetime.strptime(text, "%Y-%m-%d").date() - EPOCH_DAY).days
+
+
+def _to_strings(values):
+    """
+    Object array of str from a bytes (e.g. S12 on disk) or str array
+    """
+    values = np.asarray(values)
+    convert = bytes.decode if values.dtype.kind == 'S' else str
+    return np.asarray([convert(value) for value in values.tolist()], dtype=object)
+
+
+def _empty_columns():
+    return {column: np.empty(0, dtype=dtype) for column, dtype in COLUMN_DTYPES.items()}
+
+
+class _AppendBuffer:
+    """
+    Append-only columns with amortized O(1) appends. Positions below size are never
+    written again, so views handed to snapshots stay valid while appends continue.
+    """
+
+    def __init__(self, dtypes):
+        self._columns = {column: np.empty(0, dtype=dtype) for column, dtype in dtypes.items()}
+        self.size = 0
+
+    def append(self, values):
+        """
+        Append one row; values are in column order
+        """
+        if self.size == len(next(iter(self._columns.values()))):
+            capacity = max(64, 2 * self.size)
+            for column, array in self._columns.items():
+                grown = np.empty(capacity, dtype=array.dtype)
+                grown[:self.size] = array
+                self._columns[column] = grown
+        for array, value in zip(self._columns.values(), values):
+            array[self.size] = value
+        self.size += 1
+
+    def view(self):
+        return {column: array[:self.size] for column, array in self._columns.items()}
+
+
+class _Snapshot:
+    """
+    Immutable view used by readers
+    """
+
+    def __init__(self, main, cell_keys, dead, delta, delta_dead, medicine_keys, medicine_labels):
+        self.main = main
+        self.cell_keys = cell_keys
+        # Positions of replaced rows in main and in delta
+        self.dead = dead
+        self.delta = delta
+        self.delta_dead = delta_dead
+        # Lowercased names for matching, and the first-seen spelling for responses
+        self.medicine_keys = medicine_keys
+        self.medicine_labels = medicine_labels
+
+
+class InventoryIndex:
+    def __init__(self, cell_deg=0.1, compact_threshold=None):
+        self.cell_deg = cell_deg
+        # None: scale with the index size, see COMPACT_FRACTION
+        self.compact_threshold = compact_threshold
+        self._n_lon_cells = int(np.ceil(360.0 / cell_deg)) + 2
+        self._lock = threading.Lock()
+        # Writer-side bookkeeping
+        self._medicine_codes = {}
+        self._medicine_labels = []
+        self._main_lookup = {}
+        self._reset_delta()
+        self._snapshot = _Snapshot(_empty_columns(), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                                   _empty_columns(), np.empty(0, dtype=np.int64), (), ())
+
+    def __len__(self):
+        snapshot = self._snapshot
+        return (len(snapshot.cell_keys) - len(snapshot.dead)
+                + len(snapshot.delta['pharmacy_id']) - len(snapshot.delta_dead))
+
+    def _reset_delta(self):
+        self._main_dead = _AppendBuffer({'row': np.int64})
+        self._delta = _AppendBuffer(COLUMN_DTYPES)
+        self._delta_lookup = {}
+        self._delta_dead = _AppendBuffer({'row': np.int64})
+
+    def _cell_keys(self, latitudes, longitudes):
+        lat_cells = np.floor((np.asarray(latitudes) + 90.0) / self.cell_deg).astype(np.int64)
+        lon_cells = np.floor((np.asarray(longitudes) + 180.0) / self.cell_deg).astype(np.int64)
+        return lat_cells * self._n_lon_cells + lon_cells
+
+    def _medicine_code(self, medicine_name):
+        key = str(medicine_name).lower()
+        if key not in self._medicine_codes:
+            self._medicine_codes[key] = len(self._medicine_codes)
+            self._medicine_labels.append(str(medicine_name))
+        return self._medicine_codes[key]
+
+    def _row_record(self, row):
+        """
+        Convert one row dict to a tuple in ALL_COLUMNS order; raises on missing or invalid fields
+        """
+        record = (
+            str(row['pharmacy_id']),
+            row.get('name'),
+            float(row['latitude']),
+            float(row['longitude']),
+            float(row['price']),
+            float(row['stock']),
+            to_epoch_day(row['expiry_date'] if 'expiry_date' in row else row['expiry_day'])
+        )
+        if not np.isfinite(record[2:6]).all():
+            raise ValueError("Non-finite numeric field")
+        if not (-90.0 <= record[2] <= 90.0 and -180.0 <= record[3] <= 180.0):
+            raise ValueError("Coordinates out of range")
+        return record[:2] + (self._medicine_code(row['medicine_name']),) + record[2:]
+
+    def _rows_to_columns(self, rows):
+        """
+        Convert row dicts to columns; rows with missing or invalid fields are skipped
+        """
+        records = []
+        for row in rows:
+            try:
+                records.append(self._row_record(row))
+            except (KeyError, ValueError, TypeError, AttributeError, OverflowError):
+                continue
+        columns = _empty_columns()
+        if records:
+            for column, values in zip(ALL_COLUMNS, zip(*records)):
+                columns[column] = np.asarray(values, dtype=columns[column].dtype)
+        return columns
+
+    def _publish(self, main=None, cell_keys=None):
+        """
+        Build a fresh snapshot from writer state and swap it in (caller holds the lock).
+        Only views of the append buffers are taken, so this is O(1) in the delta size.
+        """
+        current = self._snapshot
+        medicine_keys, medicine_labels = current.medicine_keys, current.medicine_labels
+        if len(medicine_keys) != len(self._medicine_codes) or main is not None:
+            medicine_keys, medicine_labels = tuple(self._medicine_codes), tuple(self._medicine_labels)
+        self._snapshot = _Snapshot(
+            current.main if main is None else main,
+            current.cell_keys if cell_keys is None else cell_keys,
+            self._main_dead.view()['row'],
+            self._delta.view(),
+            self._delta_dead.view()['row'],
+            medicine_keys,
+            medicine_labels
+        )
+
+    def _rebuild(self, columns):
+        """
+        Replace the main arrays with columns, sorted by grid cell (caller holds the lock).
+        When a (pharmacy_id, medicine) key appears more than once only its last row is kept,
+        so every live main row can be tombstoned by an upsert.
+        """
+        last = {key: i for i, key in enumerate(zip(columns['pharmacy_id'].tolist(),
+                                                   columns['medicine_code'].tolist()))}
+        keep = np.fromiter(last.values(), dtype=np.int64, count=len(last))
+        cell_keys = self._cell_keys(columns['latitude'][keep], columns['longitude'][keep])
+        order = np.argsort(cell_keys, kind='stable')
+        rows = keep[order]
+        main = {column: values[rows] for column, values in columns.items()}
+        # Sorted position of each kept row, in the same order as last
+        positions = np.empty(len(order), dtype=np.int64)
+        positions[order] = np.arange(len(order))
+        self._main_lookup = dict(zip(last, positions.tolist()))
+        self._reset_delta()
+        self._publish(main, cell_keys[order])
+
+    def load_rows(self, rows):
+        """
+        Replace the whole index with rows (dicts with pharmacy_id, medicine_name,
+        latitude, longitude, price, stock, expiry_date and optionally name)
+        """
+        with self._lock:
+            self._medicine_codes = {}
+            self._medicine_labels = []
+            self._rebuild(self._rows_to_columns(rows))
+
+    def load_columns(self, columns):
+        """
+        Replace the whole index with columnar data (arrays for pharmacy_id, medicine_name,
+        latitude, longitude, price, stock, expiry_day and optionally name), without going
+        through per-row dicts. Rows with non-finite or out-of-range numeric values are skipped.
+        """
+        numeric = {column: np.asarray(columns[column], dtype=np.float64) for column in NUMERIC_COLUMNS}
+        valid = np.logical_and.reduce([np.isfinite(values) for values in numeric.values()])
+        valid &= (np.abs(numeric['latitude']) <= 90.0) & (np.abs(numeric['longitude']) <= 180.0)
+        valid &= (numeric['expiry_day'] >= MIN_EPOCH_DAY) & (numeric['expiry_day'] <= MAX_EPOCH_DAY)
+        medicine_names, medicine_inverse = np.unique(np.asarray(columns['medicine_name'])[valid],
+                                                     return_inverse=True)
+        pharmacy_ids = np.asarray(columns['pharmacy_id'])[valid]
+        if 'name' in columns:
+            names = np.asarray(columns['name'], dtype=object)[valid]
+        else:
+            names = np.full(len(pharmacy_ids), None, dtype=object)
+
+        with self._lock:
+            self._medicine_codes = {}
+            self._medicine_labels = []
+            codes = np.asarray([self._medicine_code(name) for name in _to_strings(medicine_names)],
+                               dtype=np.int32)
+            self._rebuild({
+                'pharmacy_id': _to_strings(pharmacy_ids),
+                'name': names,
+                'medicine_code': codes[medicine_inverse.reshape(-1)] if len(codes) else np.empty(0, dtype=np.int32),
+                **{column: values[valid] for column, values in numeric.items()}
+            })
+
+    def load_snapshot(self, path):
+        """
+        Load a JSONL export (one inventory row per line) or a columnar directory
+        written by create_dataset.write_inventory_columns
+        """
+        if os.path.isdir(path):
+            self.load_columns(load_inventory_columns(path))
+        else:
+            with open(path) as f:
+                self.load_rows(json.loads(line) for line in f if line.strip())
+
+    def upsert(self, rows):
+        """
+        Insert or replace rows keyed by (pharmacy_id, medicine_name) without a full rebuild.
+        Returns the number of rows accepted.
+        """
+        with self._lock:
+            accepted = 0
+            for row in rows:
+                try:
+                    record = self._row_record(row)
+                except (KeyError, ValueError, TypeError, AttributeError, OverflowError):
+                    continue
+                key = (record[0], record[2])
+                main_row = self._main_lookup.pop(key, None)
+                if main_row is not None:
+                    self._main_dead.append((main_row,))
+                delta_row = self._delta_lookup.get(key)
+                if delta_row is not None:
+                    self._delta_dead.append((delta_row,))
+                self._delta_lookup[key] = self._delta.size
+                self._delta.append(record)
+                accepted += 1
+
+            if self._delta.size > self._compact_threshold():
+                self._compact()
+            else:
+                self._publish()
+            return accepted
+
+    def _compact_threshold(self):
+        if self.compact_threshold is not None:
+            return self.compact_threshold
+        return max(MIN_COMPACT_ROWS, int(len(self._snapshot.cell_keys) * COMPACT_FRACTION))
+
+    def _compact(self):
+        """
+        Merge live main rows and the delta buffer into new sorted main arrays (caller holds the lock)
+        """
+        # Rows appended since the last publish are not in the snapshot yet, so read the buffers
+        snapshot = self._snapshot
+        live = np.ones(len(snapshot.cell_keys), dtype=bool)
+        live[self._main_dead.view()['row']] = False
+        delta = self._delta.view()
+        delta_live = np.ones(self._delta.size, dtype=bool)
+        delta_live[self._delta_dead.view()['row']] = False
+        merged = {column: np.concatenate([snapshot.main[column][live], delta[column][delta_live]])
+                  for column in ALL_COLUMNS}
+        self._rebuild(merged)
+
+    @staticmethod
+    def _lon_delta(latitude, radius_km):
+        """
+        Half-width in degrees of the longitude band holding every point within radius_km
+        of a point at latitude, or None when the circle covers all longitudes
+        """
+        angular = radius_km / EARTH_RADIUS_KM
+        lat_delta = np.degrees(angular)
+        ratio = np.sin(angular) / max(np.cos(np.radians(latitude)), 1e-12)
+        if latitude + lat_delta >= 90.0 or latitude - lat_delta <= -90.0 or ratio >= 1.0:
+            # The circle contains a pole (or wraps all the way around): every longitude
+            return None
+        return np.degrees(np.arcsin(ratio))
+
+    def _candidates(self, snapshot, latitude, longitude, radius_km):
+        """
+        Indices of main rows in grid cells overlapping the query's bounding box
+        """
+        if not len(snapshot.cell_keys):
+            return np.empty(0, dtype=np.int64)
+        lat_delta = radius_km / KM_PER_DEGREE
+        lat_lo, lat_hi = max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0)
+        lon_delta = self._lon_delta(latitude, radius_km)
+        # Split the band in two when it crosses the antimeridian
+        if lon_delta is None:
+            lon_ranges = [(-180.0, 180.0)]
+        elif longitude - lon_delta < -180.0:
+            lon_ranges = [(-180.0, longitude + lon_delta), (longitude - lon_delta + 360.0, 180.0)]
+        elif longitude + lon_delta > 180.0:
+            lon_ranges = [(-180.0, longitude + lon_delta - 360.0), (longitude - lon_delta, 180.0)]
+        else:
+            lon_ranges = [(longitude - lon_delta, longitude + lon_delta)]
+
+        latitudes = np.arange(lat_lo, lat_hi + self.cell_deg, self.cell_deg).clip(max=lat_hi)
+        ranges = []
+        for lon_lo, lon_hi in lon_ranges:
+            low_keys = np.unique(self._cell_keys(latitudes, lon_lo))
+            high_keys = low_keys - self._cell_keys(0.0, lon_lo) + self._cell_keys(0.0, lon_hi)
+            starts = np.searchsorted(snapshot.cell_keys, low_keys, side='left')
+            ends = np.searchsorted(snapshot.cell_keys, high_keys, side='right')
+            # One disjoint, increasing range per grid row
+            ranges += [np.arange(s, e) for s, e in zip(starts.tolist(), ends.tolist()) if e > s]
+        candidates = np.concatenate(ranges) if ranges else np.empty(0, dtype=np.int64)
+        if len(snapshot.dead):
+            candidates = candidates[~np.isin(candidates, snapshot.dead)]
+        return candidates
+
+    def search(self, medicine_name, latitude, longitude, radius_km=20.0, today=None):
+        """
+        Rows matching medicine_name (case-insensitive substring, like the Mongo $regex search)
+        within radius_km that are in stock and not expired on today (days since epoch, default now).
+        Returns a dict of columns including distance_km.
+        """
+        snapshot = self._snapshot
+        needle = str(medicine_name).lower()
+        codes = np.asarray([code for code, key in enumerate(snapshot.medicine_keys) if needle in key],
+                           dtype=np.int32)
+        if today is None:
+            today = (date.today() - EPOCH_DAY).days
+
+        main_rows = self._candidates(snapshot, latitude, longitude, radius_km)
+        delta = snapshot.delta
+        delta_rows = np.arange(len(delta['pharmacy_id']))
+        if len(snapshot.delta_dead):
+            delta_rows = delta_rows[~np.isin(delta_rows, snapshot.delta_dead)]
+        parts = [
+            self._filter(snapshot.main, main_rows, codes, latitude, longitude, radius_km, today),
+            self._filter(delta, delta_rows, codes, latitude, longitude, radius_km, today)
+        ]
+
+        result = {column: np.concatenate([part[column] for part in parts]) for column in parts[0]}
+        result['medicine_name'] = np.asarray(snapshot.medicine_labels + ('',), dtype=object)[result['medicine_code']]
+        return result
+
+    @staticmethod
+    def _filter(columns, rows, codes, latitude, longitude, radius_km, today):
+        """
+        Apply the medicine/stock/expiry filters on cheap numeric columns first,
+        then compute distances only for the survivors and gather their columns
+        """
+        keep = (
+            np.isin(columns['medicine_code'][rows], codes)
+            & (columns['stock'][rows] > 0)
+            & (columns['expiry_day'][rows] >= today)
+        )
+        rows = rows[keep]
+        distances = haversine_km(latitude, longitude, columns['latitude'][rows], columns['longitude'][rows])
+        within = distances <= radius_km
+        rows = rows[within]
+        result = {column: columns[column][rows] for column in ALL_COLUMNS}
+        result['distance_km'] = distances[within]
+        return result
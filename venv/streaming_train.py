@@ -0,0 +1,246 @@
+import argparse
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+
+from train_model import FEATURE_NAMES, TARGET_REVERSED, TARGET_WEIGHTS, save_ml_model
+
+# Out-of-core trainer for create_ml_model's model.
+#
+# The training target is a weighted sum of min/max-normalised features, i.e. it
+# is linear in the raw features once the global min/max are known:
+#     y = a + X @ b
+# So a single pass that accumulates count, mean, the centred comoment matrix
+# (X - mean)^T (X - mean) and per-feature min/max is enough: X^T y follows from
+# X^T X and b. Shard statistics merge exactly (Chan et al.), so files or byte
+# ranges of one file can be processed by a process pool and combined.
+
+
+class FeatureStats:
+    """
+    Mergeable one-pass statistics over feature rows
+    """
+
+    def __init__(self, n_features=len(FEATURE_NAMES)):
+        self.n = 0
+        self.mean = np.zeros(n_features)
+        self.comoment = np.zeros((n_features, n_features))
+        self.min = np.full(n_features, np.inf)
+        self.max = np.full(n_features, -np.inf)
+        self.skipped = 0
+
+    def update(self, X):
+        """
+        Fold a chunk of rows into the statistics
+        """
+        if len(X) == 0:
+            return
+        chunk = FeatureStats(X.shape[1])
+        chunk.n = len(X)
+        chunk.mean = X.mean(axis=0)
+        centered = X - chunk.mean
+        chunk.comoment = centered.T @ centered
+        chunk.min = X.min(axis=0)
+        chunk.max = X.max(axis=0)
+        self.merge(chunk)
+
+    def merge(self, other):
+        """
+        Combine with statistics computed over a disjoint set of rows
+        """
+        self.skipped += other.skipped
+        if other.n == 0:
+            return
+        if self.n == 0:
+            self.n, self.mean, self.comoment = other.n, other.mean.copy(), other.comoment.copy()
+            self.min, self.max = other.min.copy(), other.max.copy()
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.comoment = self.comoment + other.comoment + np.outer(delta, delta) * (self.n * other.n / n)
+        self.mean = self.mean + delta * (other.n / n)
+        self.n = n
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+
+
+def _read_rows(f, end, chunk_size, parse_line):
+    """
+    Yield float64 feature chunks from an open file until the byte offset end
+    """
+    rows = []
+    skipped = 0
+    while f.tell() <= end:
+        line = f.readline()
+        if not line:
+            break
+        if not line.strip():
+            continue
+        try:
+            rows.append(parse_line(line))
+        except (ValueError, TypeError, KeyError, IndexError):
+            skipped += 1
+            continue
+        if len(rows) >= chunk_size:
+            yield np.asarray(rows, dtype=np.float64), skipped
+            rows, skipped = [], 0
+    if rows or skipped:
+        yield np.asarray(rows, dtype=np.float64).reshape(-1, len(FEATURE_NAMES)), skipped
+
+
+def _jsonl_parser():
+    def parse_line(line):
+        record = json.loads(line)
+        return [float(record[name]) for name in FEATURE_NAMES]
+    return parse_line
+
+
+def _csv_parser(header):
+    columns = [header.index(name) for name in FEATURE_NAMES]
+
+    def parse_line(line):
+        values = next(csv.reader(io.StringIO(line.decode('utf-8'))))
+        return [float(values[i]) for i in columns]
+    return parse_line
+
+
+def compute_shard_stats(shard):
+    """
+    Statistics for one (path, start, end, chunk_size) byte range.
+    A shard owns every line that starts inside [start, end].
+    """
+    path, start, end, chunk_size = shard
+    stats = FeatureStats()
+    with open(path, 'rb') as f:
+        if path.endswith('.csv'):
+            header = next(csv.reader([f.readline().decode('utf-8')]))
+            parse_line = _csv_parser([h.strip() for h in header])
+            start = max(start, f.tell())
+        else:
+            parse_line = _jsonl_parser()
+
+        f.seek(start)
+        if start > 0:
+            # Step back one byte so a shard starting exactly on a line boundary keeps that line
+            f.seek(start - 1)
+            f.readline()
+
+        for X, skipped in _read_rows(f, end, chunk_size, parse_line):
+            stats.update(X)
+            stats.skipped += skipped
+    return stats
+
+
+def plan_shards(paths, workers, chunk_size):
+    """
+    Split every file into roughly equal byte ranges, about one per worker
+    """
+    shards = []
+    for path in paths:
+        size = os.path.getsize(path)
+        pieces = max(1, min(workers, size // (1 << 20) or 1))
+        bounds = np.linspace(0, size, pieces + 1).astype(int)
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            # end is inclusive of a line starting at end - 1; the next shard starts at end
+            shards.append((path, int(start), int(end) - 1, chunk_size))
+    return shards
+
+
+def collect_stats(paths, workers=os.cpu_count(), chunk_size=100_000):
+    """
+    Compute merged FeatureStats over JSONL/CSV files, in parallel when workers > 1
+    """
+    shards = plan_shards(paths, workers, chunk_size)
+    total = FeatureStats()
+    if workers <= 1 or len(shards) == 1:
+        for shard in shards:
+            total.merge(compute_shard_stats(shard))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for stats in pool.map(compute_shard_stats, shards):
+            total.merge(stats)
+    return total
+
+
+def fit_from_stats(stats):
+    """
+    Build the same model package as create_ml_model from accumulated statistics
+    """
+    if stats.n == 0:
+        raise ValueError("No valid training rows")
+
+    # Target y = a + X @ b from the global min/max (constant features contribute their full weight)
+    a = 0.0
+    b = np.zeros(len(FEATURE_NAMES))
+    for i, name in enumerate(FEATURE_NAMES):
+        weight = TARGET_WEIGHTS[name]
+        value_range = stats.max[i] - stats.min[i]
+        if value_range == 0:
+            a += weight
+        elif TARGET_REVERSED[name]:
+            a += weight * stats.max[i] / value_range
+            b[i] = -weight / value_range
+        else:
+            a -= weight * stats.min[i] / value_range
+            b[i] = weight / value_range
+
+    covariance = stats.comoment / stats.n
+    variance = np.diag(covariance).copy()
+    # StandardScaler leaves zero-variance features unscaled
+    scale = np.sqrt(variance)
+    scale[scale == 0] = 1.0
+
+    # Normal equations on standardised features: R coef = cov(X_scaled, y)
+    correlation = covariance / np.outer(scale, scale)
+    target_covariance = (covariance @ b) / scale
+    coef = np.linalg.lstsq(correlation, target_covariance, rcond=None)[0]
+    intercept = a + stats.mean @ b
+
+    scaler = StandardScaler()
+    scaler.mean_ = stats.mean
+    scaler.var_ = variance
+    scaler.scale_ = scale
+    scaler.n_samples_seen_ = stats.n
+    scaler.n_features_in_ = len(FEATURE_NAMES)
+
+    model = LinearRegression()
+    model.coef_ = coef
+    model.intercept_ = float(intercept)
+    model.n_features_in_ = len(FEATURE_NAMES)
+
+    return {
+        'model': model,
+        'scaler': scaler,
+        'feature_means': scaler.mean_.tolist(),
+        'feature_stds': scaler.scale_.tolist(),
+        'feature_names': list(FEATURE_NAMES)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the pharmacy ranking model from JSONL/CSV shards")
+    parser.add_argument('paths', nargs='+', help="JSONL or CSV files (one pharmacy per line)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument('--chunk-size', type=int, default=100_000, help="Rows per in-memory chunk")
+    parser.add_argument('--output', default="pharmacy_ml_model.pkl", help="Model pickle path")
+    args = parser.parse_args()
+
+    print(f"Collecting statistics from {len(args.paths)} file(s) with {args.workers} worker(s)...")
+    stats = collect_stats(args.paths, workers=args.workers, chunk_size=args.chunk_size)
+    print(f"Processed {stats.n} rows ({stats.skipped} skipped)")
+
+    ml_model = fit_from_stats(stats)
+    save_ml_model(ml_model, args.output)
+
+    print(f"\nModel Coefficients: {ml_model['model'].coef_}")
+    print(f"Model Intercept: {ml_model['model'].intercept_:.4f}")
+
+
+if __name__ == "__main__":
+    main()
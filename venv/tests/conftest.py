@@ -0,0 +1,28 @@
+import os
+import sys
+
+# The service modules live next to this directory rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="session")
+def api_client(tmp_path_factory):
+    """
+    Flask test client with a freshly trained model registered as the active version
+    """
+    import pharmacy_api
+    from model_artifact import export_model_artifact
+    from train_model import create_ml_model
+
+    rng = np.random.default_rng(0)
+    training_rows = [
+        {"distance_km": float(d), "price": float(p), "stock": float(s)}
+        for d, p, s in zip(rng.uniform(0.5, 10, 200), rng.integers(20, 100, 200), rng.integers(10, 100, 200))
+    ]
+    path = str(tmp_path_factory.mktemp("model") / "model.npz")
+    export_model_artifact(create_ml_model(training_rows), path)
+    pharmacy_api.model_registry.load(path)
+    return pharmacy_api.app.test_client()
@@ -0,0 +1,81 @@
+from instrumentation import PROMETHEUS_CONTENT_TYPE, MetricsRegistry, SampledProfiler
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 0.5, 1.0), labelnames=("stage",))
+    for value in (0.05, 0.1, 0.3, 0.7, 5.0):
+        histogram.observe(value, "predict")
+    histogram.observe(0.2, "parse")
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP latency_seconds Latency", "# TYPE latency_seconds histogram"]
+    # Series are sorted by label values; a value equal to a bound falls in that bucket (le is inclusive)
+    assert lines[2:] == [
+        'latency_seconds_bucket{stage="parse",le="0.1"} 0',
+        'latency_seconds_bucket{stage="parse",le="0.5"} 1',
+        'latency_seconds_bucket{stage="parse",le="1.0"} 1',
+        'latency_seconds_bucket{stage="parse",le="+Inf"} 1',
+        'latency_seconds_sum{stage="parse"} 0.2',
+        'latency_seconds_count{stage="parse"} 1',
+        'latency_seconds_bucket{stage="predict",le="0.1"} 2',
+        'latency_seconds_bucket{stage="predict",le="0.5"} 3',
+        'latency_seconds_bucket{stage="predict",le="1.0"} 4',
+        'latency_seconds_bucket{stage="predict",le="+Inf"} 5',
+        'latency_seconds_sum{stage="predict"} 6.15',
+        'latency_seconds_count{stage="predict"} 5',
+    ]
+
+
+def test_histogram_timer_and_unlabelled_counter():
+    registry = MetricsRegistry()
+    counter = registry.counter("rejected_total", "Rejected rows")
+    histogram = registry.histogram("stage_seconds", "Stage time")
+    counter.inc()
+    counter.inc(amount=4)
+    with histogram.time():
+        pass
+
+    text = registry.render()
+    assert text.endswith("\n")
+    assert "rejected_total 5.0" in text.splitlines()
+    assert 'stage_seconds_bucket{le="+Inf"} 1' in text
+    assert "stage_seconds_count 1" in text
+
+
+def test_labelled_counter_keeps_series_apart():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", labelnames=("endpoint", "status"))
+    counter.inc("rank", "200")
+    counter.inc("rank", "200")
+    counter.inc("rank", "400")
+    assert registry.render().splitlines()[2:] == [
+        'requests_total{endpoint="rank",status="200"} 2.0',
+        'requests_total{endpoint="rank",status="400"} 1.0',
+    ]
+
+
+def test_profiler_samples_every_nth_request():
+    profiler = SampledProfiler()
+    assert profiler.maybe_start_sample() is None
+
+    profiler.start(duration=60, sample_every=3)
+    taken = 0
+    for _ in range(9):
+        profile = profiler.maybe_start_sample()
+        if profile is not None:
+            sum(range(1000))
+            profiler.finish_sample(profile)
+            taken += 1
+    assert taken == 3
+    assert profiler.report(limit=5).startswith("3 sampled requests")
+
+
+def test_metrics_endpoint(api_client):
+    api_client.post('/rank', json=[{"pharmacy_id": "P1", "distance_km": 1, "price": 20, "stock": 5}])
+    response = api_client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == PROMETHEUS_CONTENT_TYPE
+    text = response.get_data(as_text=True)
+    assert 'pharmacy_api_requests_total{endpoint="rank_pharmacies",status="200"}' in text
+    assert 'pharmacy_api_stage_seconds_bucket{stage="feature_matrix",le="+Inf"}' in text
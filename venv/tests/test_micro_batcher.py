@@ -0,0 +1,85 @@
+import threading
+
+import numpy as np
+import pytest
+
+from micro_batcher import BatcherClosedError, MicroBatcher, QueueFullError, ScoringTimeoutError
+
+
+def sum_rows(X, ml_model):
+    return X.sum(axis=1) * ml_model['scale']
+
+
+def test_concurrent_callers_get_their_own_slices():
+    batcher = MicroBatcher(sum_rows, window_ms=20, max_batch=10_000)
+    model = {'scale': 2.0}
+    inputs = [np.full((i + 1, 3), float(i)) for i in range(8)]
+    results = [None] * len(inputs)
+
+    def call(i):
+        results[i] = batcher.score(inputs[i], model, timeout=5)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(inputs))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    for X, scores in zip(inputs, results):
+        np.testing.assert_allclose(scores, X.sum(axis=1) * 2.0)
+
+
+def test_close_drains_queue_and_stops_thread():
+    batcher = MicroBatcher(sum_rows, window_ms=50)
+    future = batcher.submit(np.ones((2, 3)), {'scale': 1.0})
+    batcher.close(timeout=5)
+
+    np.testing.assert_allclose(future.result(timeout=0), [3.0, 3.0])
+    assert not batcher.is_alive()
+    with pytest.raises(BatcherClosedError):
+        batcher.submit(np.ones((1, 3)), {'scale': 1.0})
+
+
+def test_scoring_errors_reach_every_caller():
+    def fail(X, ml_model):
+        raise ValueError("boom")
+
+    batcher = MicroBatcher(fail, window_ms=1)
+    with pytest.raises(ValueError):
+        batcher.score(np.ones((1, 3)), {}, timeout=5)
+    batcher.close()
+
+
+def test_full_queue_rejects_submissions():
+    blocker = threading.Event()
+
+    def wait(X, ml_model):
+        blocker.wait(5)
+        return X.sum(axis=1)
+
+    batcher = MicroBatcher(wait, window_ms=0, max_queue=1)
+    first = batcher.submit(np.ones((1, 3)), {})
+    # Wait until the scheduler has taken the first item and is blocked scoring it
+    while batcher.queue_depth():
+        pass
+    batcher.submit(np.ones((1, 3)), {})
+    with pytest.raises(QueueFullError):
+        batcher.submit(np.ones((1, 3)), {})
+    blocker.set()
+    first.result(timeout=5)
+    batcher.close()
+
+
+def test_score_times_out_when_scheduler_is_stuck():
+    release = threading.Event()
+
+    def stuck(X, ml_model):
+        release.wait(5)
+        return X.sum(axis=1)
+
+    batcher = MicroBatcher(stuck, window_ms=0)
+    with pytest.raises(ScoringTimeoutError):
+        batcher.score(np.ones((1, 3)), {}, timeout=0.05)
+    release.set()
+    batcher.close()
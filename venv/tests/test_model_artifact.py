@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from model_artifact import ARTIFACT_VERSION, export_model_artifact, load_model_artifact
+from train_model import FEATURE_NAMES, create_ml_model
+
+
+@pytest.fixture(scope="module")
+def trained():
+    rng = np.random.default_rng(0)
+    rows = [{"distance_km": float(d), "price": float(p), "stock": float(s)}
+            for d, p, s in zip(rng.uniform(0.5, 10, 100), rng.integers(20, 100, 100), rng.integers(10, 100, 100))]
+    return create_ml_model(rows)
+
+
+def rewrite(path, **changes):
+    """
+    Re-save an artifact with some fields replaced, keeping the stored checksum
+    """
+    with np.load(path, allow_pickle=False) as data:
+        fields = dict(data)
+    fields.update(changes)
+    np.savez(path, **fields)
+
+
+def test_round_trip_predicts_like_sklearn(tmp_path, trained):
+    path = str(tmp_path / "model.npz")
+    export_model_artifact(trained, path)
+    loaded = load_model_artifact(path)
+
+    assert loaded['feature_names'] == list(FEATURE_NAMES)
+    assert loaded['version'] == ARTIFACT_VERSION
+    X = np.random.default_rng(1).uniform(0, 100, size=(50, 3))
+    scaled = trained['scaler'].transform(X)
+    np.testing.assert_allclose(loaded['model'].predict((X - loaded['feature_means']) / loaded['feature_stds']),
+                               trained['model'].predict(scaled), rtol=1e-12)
+
+
+def test_artifact_does_not_need_pickle(tmp_path, trained):
+    path = str(tmp_path / "model.npz")
+    export_model_artifact(trained, path)
+    with np.load(path, allow_pickle=False) as data:
+        assert all(data[name].dtype != object for name in data.files)
+
+
+@pytest.mark.parametrize("field", ["coef", "intercept", "feature_means", "feature_stds"])
+def test_checksum_mismatch_is_rejected(tmp_path, trained, field):
+    path = str(tmp_path / "model.npz")
+    export_model_artifact(trained, path)
+    with np.load(path) as data:
+        tampered = data[field] + 1.0
+    rewrite(path, **{field: tampered})
+
+    with pytest.raises(ValueError, match="checksum"):
+        load_model_artifact(path)
+
+
+def test_renamed_features_fail_checksum(tmp_path, trained):
+    path = str(tmp_path / "model.npz")
+    export_model_artifact(trained, path)
+    rewrite(path, feature_names=np.asarray(["price", "distance_km", "stock"]))
+    with pytest.raises(ValueError, match="checksum"):
+        load_model_artifact(path)
+
+
+def test_unknown_version_is_rejected(tmp_path, trained):
+    path = str(tmp_path / "model.npz")
+    export_model_artifact(trained, path)
+    rewrite(path, version=np.asarray(ARTIFACT_VERSION + 1))
+    with pytest.raises(ValueError, match="Unsupported model artifact version"):
+        load_model_artifact(path)
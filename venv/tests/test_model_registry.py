@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from model_registry import ModelRegistry
+
+
+def write_model(path, content):
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def read_model(path):
+    with open(path) as f:
+        content = f.read()
+    if content == "broken":
+        raise ValueError("unusable model")
+    return {'content': content}
+
+
+def test_load_activates_and_keeps_versions(tmp_path):
+    registry = ModelRegistry(read_model, max_models=2)
+    first, second = tmp_path / "a.npz", tmp_path / "b.npz"
+    write_model(first, "a")
+    write_model(second, "b")
+
+    v1 = registry.load(str(first))
+    v2 = registry.load(str(second), activate=False)
+
+    assert registry.active_version() == v1
+    assert registry.get()['content'] == "a"
+    assert registry.get(v2)['content'] == "b"
+    assert registry.activate(v2)
+    assert registry.get()['content'] == "b"
+    assert not registry.activate("missing")
+
+
+def test_eviction_never_drops_active_version(tmp_path):
+    registry = ModelRegistry(read_model, max_models=2)
+    paths = []
+    for name in "abc":
+        path = tmp_path / f"{name}.npz"
+        write_model(path, name)
+        paths.append(str(path))
+
+    active = registry.load(paths[0])
+    registry.load(paths[1], activate=False)
+    registry.load(paths[2], activate=False)
+
+    versions = [entry['version'] for entry in registry.versions()]
+    assert len(versions) == 2
+    assert active in versions
+
+
+def test_failed_load_keeps_current_state(tmp_path):
+    registry = ModelRegistry(read_model)
+    good, bad = tmp_path / "good.npz", tmp_path / "bad.npz"
+    write_model(good, "good")
+    write_model(bad, "broken")
+
+    version = registry.load(str(good))
+    with pytest.raises(ValueError):
+        registry.load(str(bad))
+    assert registry.active_version() == version
+    assert len(registry.versions()) == 1
+
+
+def test_poll_picks_up_either_watched_file(tmp_path):
+    registry = ModelRegistry(read_model)
+    pickle_path, artifact_path = tmp_path / "m.pkl", tmp_path / "m.npz"
+    write_model(pickle_path, "old")
+    write_model(artifact_path, "old")
+    last_mtimes = {str(pickle_path): os.path.getmtime(pickle_path),
+                   str(artifact_path): os.path.getmtime(artifact_path)}
+
+    # Only the pickle is shipped
+    write_model(pickle_path, "retrained")
+    os.utime(pickle_path, (0, os.path.getmtime(artifact_path) + 10))
+    registry.poll_once(last_mtimes)
+
+    assert registry.get()['content'] == "retrained"
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+
+def pharmacies(n, seed):
+    rng = np.random.default_rng(seed)
+    return [
+        {"pharmacy_id": f"S{seed}-{i}", "distance_km": float(rng.uniform(0.5, 10)),
+         "price": int(rng.integers(20, 100)), "stock": int(rng.integers(10, 100))}
+        for i in range(n)
+    ]
+
+
+def test_batch_scores_match_individual_predicts(api_client):
+    queries = [{"query_id": f"q{seed}", "pharmacies": pharmacies(20, seed)} for seed in range(3)]
+    response = api_client.post('/predict_batch', json={"queries": queries})
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+
+    assert [r["query_id"] for r in results] == ["q0", "q1", "q2"]
+    for query, result in zip(queries, results):
+        single = api_client.post('/predict', json=query["pharmacies"]).get_json()
+        assert result["scores"] == single
+        assert result["rejected"] == 0
+
+
+def test_batch_applies_default_and_per_query_k(api_client):
+    queries = [{"pharmacies": pharmacies(10, 1)}, {"pharmacies": pharmacies(10, 2), "k": 2}]
+    results = api_client.post('/predict_batch', json={"queries": queries, "k": 4}).get_json()["results"]
+
+    assert [r["query_id"] for r in results] == [0, 1]
+    assert [len(r["scores"]) for r in results] == [4, 2]
+    for result in results:
+        scores = [s["ai_score"] for s in result["scores"]]
+        assert scores == sorted(scores, reverse=True)
+
+
+def test_batch_counts_rejected_rows_per_query(api_client):
+    bad = {"pharmacy_id": "bad", "distance_km": "x", "price": 1, "stock": 1}
+    queries = [{"pharmacies": pharmacies(3, 1) + [bad]}, {"pharmacies": [bad]}, {"pharmacies": []}]
+    results = api_client.post('/predict_batch', json={"queries": queries}).get_json()["results"]
+    assert [(len(r["scores"]), r["rejected"]) for r in results] == [(3, 1), (0, 1), (0, 0)]
+
+
+@pytest.mark.parametrize("kwargs, error", [
+    ({"data": "{not json", "content_type": "application/json"}, "Input must be an object with a 'queries' array"),
+    ({"json": [{"pharmacies": []}]}, "Input must be an object with a 'queries' array"),
+    ({"json": {"queries": [{"pharmacies": "P1"}]}}, "Query at position 0 must contain a 'pharmacies' array"),
+    ({"json": {"queries": [{"pharmacies": []}, {"pharmacies": [], "k": -1}]}},
+     "k for query at position 1 must be a positive integer"),
+    ({"json": {"queries": [{"pharmacies": []}], "k": 1e400}}, "k for query at position 0 must be a positive integer"),
+])
+def test_batch_rejects_bad_input(api_client, kwargs, error):
+    response = api_client.post('/predict_batch', **kwargs)
+    assert response.status_code == 400
+    assert response.get_json() == {"error": error, "status": "error"}
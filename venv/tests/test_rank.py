@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from pharmacy_api import top_k_indices
+
+
+def pharmacies(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {"pharmacy_id": f"P{i}", "distance_km": float(rng.uniform(0.5, 10)),
+         "price": int(rng.integers(20, 100)), "stock": int(rng.integers(10, 100))}
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("k", [1, 5, 99, 100, 150])
+def test_top_k_indices_matches_full_sort(k):
+    rng = np.random.default_rng(1)
+    # Rounded so there are plenty of ties
+    scores = np.round(rng.random(100), 1)
+    top = top_k_indices(scores, k)
+    assert len(top) == min(k, len(scores))
+    assert len(set(top.tolist())) == len(top)
+    np.testing.assert_array_equal(scores[top], np.sort(scores)[::-1][:k])
+
+
+def test_rank_returns_top_k_best_first(api_client):
+    rows = pharmacies(50)
+    response = api_client.post('/rank', json={"pharmacies": rows, "k": 5})
+    assert response.status_code == 200
+    body = response.get_json()
+    scores = [result["ai_score"] for result in body["results"]]
+    assert len(scores) == 5
+    assert scores == sorted(scores, reverse=True)
+    assert body["total_valid"] == 50
+
+    everything = api_client.post('/rank', json=rows).get_json()["results"]
+    assert [r["pharmacy_id"] for r in everything[:5]] == [r["pharmacy_id"] for r in body["results"]]
+    assert everything[0]["price"] == next(r["price"] for r in rows if r["pharmacy_id"] == everything[0]["pharmacy_id"])
+
+
+def test_rank_reads_k_from_query_string(api_client):
+    response = api_client.post('/rank?k=3', json=pharmacies(10))
+    assert response.status_code == 200
+    assert len(response.get_json()["results"]) == 3
+
+
+def test_rank_skips_invalid_rows(api_client):
+    rows = pharmacies(4) + [{"pharmacy_id": "bad", "distance_km": "far", "price": 1, "stock": 1},
+                            {"distance_km": 1, "price": 1, "stock": 1}]
+    body = api_client.post('/rank', json=rows).get_json()
+    assert body["rejected"] == 2
+    assert {r["pharmacy_id"] for r in body["results"]} == {"P0", "P1", "P2", "P3"}
+
+
+@pytest.mark.parametrize("kwargs, error", [
+    ({"data": "{not json", "content_type": "application/json"}, "Input must be an array of pharmacies"),
+    ({"json": {"pharmacies": "P1"}}, "Input must be an array of pharmacies"),
+    ({"json": []}, "No pharmacies provided"),
+    ({"json": {"pharmacies": pharmacies(3), "k": 0}}, "k must be a positive integer"),
+    ({"json": {"pharmacies": pharmacies(3), "k": "abc"}}, "k must be an integer"),
+    ({"json": {"pharmacies": pharmacies(3), "k": 1e400}}, "k must be an integer"),
+    ({"json": [{"pharmacy_id": "P1", "distance_km": None, "price": 1, "stock": 1}]},
+     "No valid pharmacies found in request"),
+])
+def test_rank_rejects_bad_input(api_client, kwargs, error):
+    response = api_client.post('/rank', **kwargs)
+    assert response.status_code == 400
+    assert response.get_json() == {"error": error, "status": "error"}
+
+
+def test_list_valued_fields_are_rejected_not_broadcast(api_client):
+    rows = [{"pharmacy_id": f"bad{i}", "distance_km": [1, 2], "price": 10, "stock": 5} for i in range(3)]
+    assert api_client.post('/predict', json=rows).status_code == 400
+    mixed = rows + pharmacies(2)
+    response = api_client.post('/predict', json=mixed)
+    assert response.status_code == 200
+    assert [r["pharmacy_id"] for r in response.get_json()] == ["P0", "P1"]
@@ -0,0 +1,181 @@
+import numpy as np
+import pytest
+
+from spatial_index import InventoryIndex, haversine_km
+
+MEDICINES = ["Paracetamol", "Ibuprofen", "Crocin", "Dolo 650"]
+TODAY = 20_500
+
+
+def random_rows(rng, n, prefix="P"):
+    return [
+        {
+            "pharmacy_id": f"{prefix}{i}",
+            "medicine_name": MEDICINES[rng.integers(len(MEDICINES))],
+            "latitude": float(rng.uniform(-89, 89)),
+            "longitude": float(rng.uniform(-180, 180)),
+            "price": float(rng.integers(20, 100)),
+            "stock": int(rng.integers(0, 5)),
+            "expiry_day": int(TODAY + rng.integers(-10, 10)),
+        }
+        for i in range(n)
+    ]
+
+
+def brute_force(rows, medicine, latitude, longitude, radius_km):
+    """
+    Keys of rows a search should return, checked one by one
+    """
+    expected = set()
+    for row in rows:
+        distance = haversine_km(latitude, longitude, row["latitude"], row["longitude"])
+        if (medicine.lower() in row["medicine_name"].lower() and row["stock"] > 0
+                and row["expiry_day"] >= TODAY and distance <= radius_km):
+            expected.add((row["pharmacy_id"], row["medicine_name"], row["price"]))
+    return expected
+
+
+def found(index, medicine, latitude, longitude, radius_km):
+    result = index.search(medicine, latitude, longitude, radius_km, today=TODAY)
+    return set(zip(result["pharmacy_id"].tolist(), result["medicine_name"].tolist(), result["price"].tolist()))
+
+
+def assert_matches_brute_force(index, rows, rng, queries=40):
+    for _ in range(queries):
+        latitude, longitude = float(rng.uniform(-89, 89)), float(rng.uniform(-180, 180))
+        radius_km = float(rng.choice([50.0, 500.0, 2000.0]))
+        medicine = MEDICINES[rng.integers(len(MEDICINES))][:4]
+        assert found(index, medicine, latitude, longitude, radius_km) == \
+            brute_force(rows, medicine, latitude, longitude, radius_km)
+
+
+@pytest.mark.parametrize("cell_deg", [0.1, 1.0, 5.0])
+def test_radius_search_matches_brute_force(cell_deg):
+    rng = np.random.default_rng(0)
+    rows = random_rows(rng, 3000)
+    index = InventoryIndex(cell_deg=cell_deg)
+    index.load_rows(rows)
+
+    assert len(index) == len(rows)
+    assert_matches_brute_force(index, rows, rng)
+
+
+@pytest.mark.parametrize("latitude,longitude", [(0.0, 179.9), (10.0, -179.95), (88.5, 30.0), (-89.9, -100.0)])
+def test_radius_search_across_antimeridian_and_poles(latitude, longitude):
+    rng = np.random.default_rng(5)
+    rows = random_rows(rng, 3000)
+    index = InventoryIndex(cell_deg=0.5)
+    index.load_rows(rows)
+    for radius_km in (100.0, 800.0, 3000.0):
+        assert found(index, "", latitude, longitude, radius_km) == brute_force(rows, "", latitude, longitude, radius_km)
+
+
+def test_search_returns_distances():
+    index = InventoryIndex()
+    index.load_rows([{"pharmacy_id": "P1", "medicine_name": "Crocin", "latitude": 12.97, "longitude": 77.59,
+                      "price": 30, "stock": 5, "expiry_date": "2030-01-01T00:00:00.000Z"}])
+    result = index.search("crocin", 12.98, 77.59, 5.0)
+    assert result["pharmacy_id"].tolist() == ["P1"]
+    assert result["distance_km"][0] == pytest.approx(1.112, abs=1e-3)
+
+
+def test_upserts_replace_and_insert():
+    rng = np.random.default_rng(1)
+    rows = random_rows(rng, 2000)
+    index = InventoryIndex(cell_deg=1.0, compact_threshold=10_000)
+    index.load_rows(rows)
+    reference = {(row["pharmacy_id"], row["medicine_name"]): row for row in rows}
+
+    # Replace main rows, replace the same rows again while they are in the delta, and insert new ones
+    updates = random_rows(rng, 300) + random_rows(rng, 300) + random_rows(rng, 200, prefix="N")
+    for start in range(0, len(updates), 50):
+        batch = updates[start:start + 50]
+        assert index.upsert(batch) == len(batch)
+        for row in batch:
+            reference[(row["pharmacy_id"], row["medicine_name"])] = row
+
+    assert len(index) == len(reference)
+    assert_matches_brute_force(index, list(reference.values()), rng)
+
+
+def test_compaction_keeps_latest_rows():
+    rng = np.random.default_rng(2)
+    rows = random_rows(rng, 500)
+    index = InventoryIndex(cell_deg=1.0, compact_threshold=100)
+    index.load_rows(rows)
+    reference = {(row["pharmacy_id"], row["medicine_name"]): row for row in rows}
+
+    for _ in range(12):
+        batch = random_rows(rng, 40) + random_rows(rng, 5, prefix=f"N{rng.integers(1_000_000)}-")
+        index.upsert(batch)
+        for row in batch:
+            reference[(row["pharmacy_id"], row["medicine_name"])] = row
+
+    # Several compactions must have happened, and the delta restarted each time
+    assert len(index._snapshot.delta["pharmacy_id"]) <= 100
+    assert len(index) == len(reference)
+    assert_matches_brute_force(index, list(reference.values()), rng)
+
+
+def test_published_snapshots_do_not_change():
+    rng = np.random.default_rng(3)
+    index = InventoryIndex(compact_threshold=10_000)
+    index.load_rows(random_rows(rng, 100))
+    index.upsert(random_rows(rng, 10, prefix="N"))
+    before = index._snapshot
+    delta_ids = before.delta["pharmacy_id"].tolist()
+
+    index.upsert(random_rows(rng, 500, prefix="M"))
+    assert before.delta["pharmacy_id"].tolist() == delta_ids
+    assert len(index) == 100 + 10 + 500
+
+
+def test_duplicate_keys_keep_last_row_and_stay_upsertable():
+    row = {"pharmacy_id": "P1", "medicine_name": "Crocin", "latitude": 1.0, "longitude": 2.0,
+           "price": 30, "stock": 5, "expiry_day": TODAY}
+    index = InventoryIndex()
+    index.load_rows([row, {**row, "price": 40}, {**row, "medicine_name": "Dolo 650"}])
+    assert len(index) == 2
+    assert found(index, "crocin", 1.0, 2.0, 10.0) == {("P1", "Crocin", 40.0)}
+
+    index.upsert([{**row, "stock": 0}])
+    assert found(index, "crocin", 1.0, 2.0, 10.0) == set()
+    assert found(index, "dolo", 1.0, 2.0, 10.0) == {("P1", "Dolo 650", 30.0)}
+
+
+def test_invalid_rows_are_skipped():
+    index = InventoryIndex()
+    good = {"pharmacy_id": "P1", "medicine_name": "Crocin", "latitude": 1.0, "longitude": 2.0,
+            "price": 10, "stock": 1, "expiry_day": TODAY}
+    bad = [
+        {**good, "latitude": "nan"},
+        {**good, "price": "abc"},
+        {key: value for key, value in good.items() if key != "stock"},
+        {**good, "expiry_day": None},
+        {**good, "expiry_day": 10**9},
+        {**good, "expiry_date": 1e400},
+        {**good, "latitude": 500},
+        {**good, "longitude": -180.5},
+    ]
+    index.load_rows([good] + bad)
+    assert len(index) == 1
+    assert index.upsert(bad) == 0
+    assert len(index) == 1
+
+
+def test_load_columns_matches_load_rows():
+    rng = np.random.default_rng(4)
+    rows = random_rows(rng, 1000)
+    by_rows = InventoryIndex(cell_deg=1.0)
+    by_rows.load_rows(rows)
+    by_columns = InventoryIndex(cell_deg=1.0)
+    by_columns.load_columns({
+        "pharmacy_id": np.asarray([row["pharmacy_id"] for row in rows], dtype="S12"),
+        "medicine_name": np.asarray([row["medicine_name"] for row in rows], dtype="S16"),
+        **{column: np.asarray([row[column] for row in rows])
+           for column in ("latitude", "longitude", "price", "stock", "expiry_day")}
+    })
+
+    assert len(by_columns) == len(rows)
+    for latitude, longitude in [(0.0, 0.0), (30.0, 60.0), (-45.0, -120.0)]:
+        assert found(by_columns, "o", latitude, longitude, 3000.0) == found(by_rows, "o", latitude, longitude, 3000.0)
@@ -0,0 +1,133 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from create_dataset import write_inventory_jsonl
+from streaming_train import FeatureStats, collect_stats, compute_shard_stats, fit_from_stats, plan_shards
+from train_model import FEATURE_NAMES, create_ml_model
+
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['pharmacy_id', 'name', *FEATURE_NAMES])
+        writer.writeheader()
+        for row in rows:
+            # Quoted commas in other columns must not shift the feature columns
+            writer.writerow({'name': f"Pharmacy, {row['pharmacy_id']}",
+                             **{key: row[key] for key in ['pharmacy_id', *FEATURE_NAMES]}})
+
+
+def feature_matrix(rows):
+    return np.asarray([[row[name] for name in FEATURE_NAMES] for row in rows], dtype=np.float64)
+
+
+def assert_stats_equal(stats, X):
+    assert stats.n == len(X)
+    np.testing.assert_allclose(stats.mean, X.mean(axis=0), rtol=1e-12)
+    centered = X - X.mean(axis=0)
+    np.testing.assert_allclose(stats.comoment, centered.T @ centered, rtol=1e-10)
+    np.testing.assert_array_equal(stats.min, X.min(axis=0))
+    np.testing.assert_array_equal(stats.max, X.max(axis=0))
+
+
+def test_merged_chunks_match_single_pass():
+    rng = np.random.default_rng(0)
+    X = rng.normal(50, 20, size=(1000, len(FEATURE_NAMES)))
+
+    merged = FeatureStats()
+    for chunk in np.array_split(X, [3, 10, 400, 401, 999]):
+        merged.update(chunk)
+    assert_stats_equal(merged, X)
+
+    # Merge order does not matter
+    left, right = FeatureStats(), FeatureStats()
+    left.update(X[:700])
+    right.update(X[700:])
+    right.merge(left)
+    assert_stats_equal(right, X)
+
+
+@pytest.fixture
+def jsonl_path(tmp_path):
+    path = tmp_path / "inventory.jsonl"
+    write_inventory_jsonl(str(path), 300, seed=7, chunk_size=128)
+    return str(path)
+
+
+@pytest.fixture
+def csv_path(tmp_path, jsonl_path):
+    path = tmp_path / "inventory.csv"
+    write_csv(path, read_jsonl(jsonl_path))
+    return str(path)
+
+
+@pytest.mark.parametrize("fixture", ["jsonl_path", "csv_path"])
+def test_every_split_point_counts_each_line_once(request, fixture):
+    path = request.getfixturevalue(fixture)
+    X = feature_matrix(read_jsonl(request.getfixturevalue("jsonl_path")))
+    with open(path, 'rb') as f:
+        size = len(f.read())
+
+    # Splitting at any byte, including line starts, line ends and inside the CSV header
+    for split in list(range(0, 200)) + list(range(size // 2 - 100, size // 2 + 100)) + [size - 1]:
+        total = FeatureStats()
+        total.merge(compute_shard_stats((path, 0, split - 1, 64)))
+        total.merge(compute_shard_stats((path, split, size - 1, 64)))
+        assert total.n == len(X), split
+        assert total.skipped == 0
+        np.testing.assert_allclose(total.mean, X.mean(axis=0), rtol=1e-12)
+
+
+def test_planned_shards_cover_file_once(jsonl_path):
+    X = feature_matrix(read_jsonl(jsonl_path))
+    shards = plan_shards([jsonl_path], workers=4, chunk_size=50)
+    # Small files are not split, so cut the single range into uneven pieces as a large file would be
+    path, start, end, chunk_size = shards[0]
+    bounds = [start, 1, 777, 5000, 5001, end + 1]
+    total = FeatureStats()
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        total.merge(compute_shard_stats((path, lo, hi - 1, chunk_size)))
+    assert_stats_equal(total, X)
+
+
+def test_bad_and_blank_lines_are_skipped(tmp_path):
+    path = tmp_path / "dirty.jsonl"
+    rows = [{"distance_km": 1.0, "price": 20, "stock": 5}, {"distance_km": 2.5, "price": 40, "stock": 9}]
+    path.write_text(json.dumps(rows[0]) + "\n\nnot json\n" + json.dumps({"price": 1}) + "\n"
+                    + json.dumps(rows[1]) + "\n")
+
+    stats = collect_stats([str(path)], workers=1)
+    assert stats.skipped == 2
+    assert_stats_equal(stats, feature_matrix(rows))
+
+
+def assert_same_model(ml_model, expected):
+    np.testing.assert_allclose(ml_model['model'].coef_, expected['model'].coef_, rtol=1e-9, atol=1e-12)
+    assert ml_model['model'].intercept_ == pytest.approx(expected['model'].intercept_, rel=1e-9)
+    np.testing.assert_allclose(ml_model['feature_means'], expected['feature_means'], rtol=1e-12)
+    np.testing.assert_allclose(ml_model['feature_stds'], expected['feature_stds'], rtol=1e-12)
+
+
+@pytest.mark.parametrize("fixture", ["jsonl_path", "csv_path"])
+def test_fit_from_stats_matches_create_ml_model(request, fixture):
+    expected = create_ml_model(read_jsonl(request.getfixturevalue("jsonl_path")))
+    ml_model = fit_from_stats(collect_stats([request.getfixturevalue(fixture)], workers=1, chunk_size=64))
+    assert_same_model(ml_model, expected)
+
+
+def test_parallel_shards_match_create_ml_model(tmp_path):
+    # Large enough (> 2 MiB) for plan_shards to split it
+    path = str(tmp_path / "large.jsonl")
+    write_inventory_jsonl(path, 12_000, seed=11)
+    assert len(plan_shards([path], workers=4, chunk_size=1000)) > 1
+
+    expected = create_ml_model(read_jsonl(path))
+    for workers in (1, 4):
+        assert_same_model(fit_from_stats(collect_stats([path], workers=workers, chunk_size=1000)), expected)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from wire_format import (FEATURES_HEADER, WireFormatError, decode_features, decode_scores,
+                         encode_features, encode_scores)
+
+
+def test_features_round_trip():
+    X = np.array([[1.5, 30.0, 10.0], [0.25, 99.0, 0.0]])
+    X_decoded, ids = decode_features(encode_features(X, ["P001", "P002"]), n_features=3, with_ids=True)
+    np.testing.assert_array_equal(X_decoded, X)
+    assert ids == ["P001", "P002"]
+
+
+def test_ids_skipped_unless_requested():
+    payload = encode_features(np.zeros((2, 3)), ["P001", "P002"])
+    assert decode_features(payload)[1] is None
+
+
+def test_features_read_without_copy():
+    payload = encode_features(np.ones((3, 3)))
+    X, _ = decode_features(payload)
+    assert not X.flags.owndata
+    assert not X.flags.writeable
+
+
+def test_empty_payload_round_trip():
+    X, ids = decode_features(encode_features(np.empty((0, 3))), n_features=3, with_ids=True)
+    assert X.shape == (0, 3)
+    assert ids is None
+
+
+def test_scores_round_trip_keeps_nan():
+    scores = np.array([0.5, np.nan, -1.0])
+    np.testing.assert_array_equal(decode_scores(encode_scores(scores)), scores)
+
+
+@pytest.mark.parametrize("payload", [
+    b"",
+    b"PHF1",
+    b"XXXX" + bytes(12),
+])
+def test_malformed_headers_rejected(payload):
+    with pytest.raises(WireFormatError):
+        decode_features(payload)
+
+
+def test_truncated_feature_block_rejected():
+    payload = encode_features(np.ones((4, 3)))
+    with pytest.raises(WireFormatError):
+        decode_features(payload[:-8])
+
+
+def test_wrong_feature_count_rejected():
+    with pytest.raises(WireFormatError):
+        decode_features(encode_features(np.ones((2, 2))), n_features=3)
+
+
+def test_id_count_mismatch_rejected():
+    payload = encode_features(np.ones((2, 3)), ["only-one"])
+    # Header says 2 rows but the id column holds a single id
+    assert FEATURES_HEADER.unpack_from(payload)[1] == 2
+    with pytest.raises(WireFormatError):
+        decode_features(payload, with_ids=True)
+
+
+def test_malformed_scores_rejected():
+    with pytest.raises(WireFormatError):
+        decode_scores(b"PHF1" + bytes(4))
+
+
+def test_invalid_utf8_ids_rejected():
+    payload = encode_features(np.ones((1, 3)), ["P001"])
+    with pytest.raises(WireFormatError):
+        decode_features(payload[:-4] + b"\xff\xfe\xfd\xfc", with_ids=True)
@@ -0,0 +1,89 @@
+import struct
+import numpy as np
+
+# Columnar binary format for /predict, selected with this Content-Type.
+#
+# Request:  header (16 bytes)  = magic b'PHF1', uint32 n_rows, uint32 n_features, uint32 ids_length
+#           features           = n_rows * n_features little-endian float64, row-major
+#                                (distance_km, price, stock)
+#           ids (optional)     = ids_length bytes of UTF-8 pharmacy ids joined by '\n'
+#
+# Response: header (8 bytes)   = magic b'PHS1', uint32 n_rows
+#           scores             = n_rows little-endian float64, NaN for rejected rows
+BINARY_MIME_TYPE = "application/x-pharmacy-features"
+
+FEATURES_MAGIC = b"PHF1"
+SCORES_MAGIC = b"PHS1"
+FEATURES_HEADER = struct.Struct("<4sIII")
+SCORES_HEADER = struct.Struct("<4sI")
+FLOAT_DTYPE = np.dtype("<f8")
+
+
+class WireFormatError(ValueError):
+    """Raised when a binary payload is malformed"""
+
+
+def encode_features(X, pharmacy_ids=None):
+    """
+    Pack a feature matrix (and optional ids) into the binary request format
+    """
+    X = np.ascontiguousarray(X, dtype=FLOAT_DTYPE)
+    if X.ndim != 2:
+        raise WireFormatError("Feature matrix must be two-dimensional")
+    ids = "\n".join(str(i) for i in pharmacy_ids).encode("utf-8") if pharmacy_ids is not None else b""
+    header = FEATURES_HEADER.pack(FEATURES_MAGIC, X.shape[0], X.shape[1], len(ids))
+    return header + X.tobytes() + ids
+
+
+def decode_features(buffer, n_features=None, with_ids=False):
+    """
+    Read a binary request without copying the feature block.
+    Returns (X, pharmacy_ids); pharmacy_ids is None unless with_ids is set and an id column was sent.
+    """
+    if len(buffer) < FEATURES_HEADER.size:
+        raise WireFormatError("Payload shorter than header")
+    magic, n_rows, n_cols, ids_length = FEATURES_HEADER.unpack_from(buffer)
+    if magic != FEATURES_MAGIC:
+        raise WireFormatError("Unknown payload magic")
+    if n_features is not None and n_cols != n_features:
+        raise WireFormatError(f"Expected {n_features} features per row, got {n_cols}")
+
+    features_length = n_rows * n_cols * FLOAT_DTYPE.itemsize
+    if len(buffer) != FEATURES_HEADER.size + features_length + ids_length:
+        raise WireFormatError("Payload length does not match header")
+
+    X = np.frombuffer(buffer, dtype=FLOAT_DTYPE, count=n_rows * n_cols,
+                      offset=FEATURES_HEADER.size).reshape(n_rows, n_cols)
+
+    pharmacy_ids = None
+    if with_ids and ids_length:
+        start = FEATURES_HEADER.size + features_length
+        try:
+            pharmacy_ids = bytes(buffer[start:start + ids_length]).decode("utf-8").split("\n")
+        except UnicodeDecodeError:
+            raise WireFormatError("Id column is not valid UTF-8")
+        if len(pharmacy_ids) != n_rows:
+            raise WireFormatError("Id column length does not match number of rows")
+    return X, pharmacy_ids
+
+
+def encode_scores(scores):
+    """
+    Pack a score vector into the binary response format
+    """
+    scores = np.ascontiguousarray(scores, dtype=FLOAT_DTYPE)
+    return SCORES_HEADER.pack(SCORES_MAGIC, scores.shape[0]) + scores.tobytes()
+
+
+def decode_scores(buffer):
+    """
+    Read a binary response into a score vector
+    """
+    if len(buffer) < SCORES_HEADER.size:
+        raise WireFormatError("Payload shorter than header")
+    magic, n_rows = SCORES_HEADER.unpack_from(buffer)
+    if magic != SCORES_MAGIC:
+        raise WireFormatError("Unknown payload magic")
+    if len(buffer) != SCORES_HEADER.size + n_rows * FLOAT_DTYPE.itemsize:
+        raise WireFormatError("Payload length does not match header")
+    return np.frombuffer(buffer, dtype=FLOAT_DTYPE, count=n_rows, offset=SCORES_HEADER.size)